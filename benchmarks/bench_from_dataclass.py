@@ -0,0 +1,48 @@
+"""Porovnani ceny prevodu radku databaze na GQL instanci (BaseGQLModel.from_dataclass).
+
+    python -m benchmarks.bench_from_dataclass [pocet_radku]
+
+"before" je puvodni prevod pres dataclasses.asdict (rekurzivni hluboka kopie),
+"after" je prevodnik sestaveny jednou pro dvojici (GQL typ, model).
+"""
+import sys
+import time
+import uuid
+import datetime
+import dataclasses
+
+from src.DBDefinitions import StudentAdmissionModel
+from src.GraphTypeDefinitions.StudentAdmissionGQLModel import StudentAdmissionGQLModel
+
+def measure(name, func, rows):
+    func(rows[:10])
+    start = time.perf_counter()
+    func(rows)
+    duration = time.perf_counter() - start
+    print(f"{name:<20} {duration / len(rows) * 1e6:10.2f} us/row")
+    return duration
+
+def main(count):
+    now = datetime.datetime.now()
+    rows = [
+        StudentAdmissionModel(
+            id=uuid.uuid4(), created=now, lastchange=now,
+            admission_id=uuid.uuid4(), student_id=uuid.uuid4(), state_id=uuid.uuid4(),
+            extended_condition_date=now, admissioned=False, enrollment_date=now, payment_id=uuid.uuid4()
+        )
+        for _ in range(count)
+    ]
+
+    def before(rows):
+        return [StudentAdmissionGQLModel(**dataclasses.asdict(row)) for row in rows]
+
+    def after(rows):
+        return [StudentAdmissionGQLModel.from_dataclass(row) for row in rows]
+
+    durationBefore = measure("before: asdict", before, rows)
+    durationAfter = measure("after: mapper", after, rows)
+    print(f"speedup {durationBefore / durationAfter:.1f}x")
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    main(count)
@@ -0,0 +1,55 @@
+"""Porovnani ceny sestaveni kontextu s loadery (get_context je volan pro kazdy dotaz).
+
+    python -m benchmarks.bench_loaders_context [pocet_opakovani]
+
+"before" je puvodni createLoadersAuto z uoishelpers (nova trida Loaders pri kazdem volani),
+"after" je createLoadersContext se tridou sestavenou jednou a loadery vytvarenymi az pri pristupu.
+"""
+import sys
+import time
+import asyncio
+
+from uoishelpers.dataloaders import createLoadersAuto
+
+from src.DBDefinitions import BaseModel
+from src.utils.Dataloaders import createLoadersContext
+
+tablesUsedByRequest = ["admissions", "student_admissions", "exam_results"]
+
+def measure(name, func, repeat):
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    duration = time.perf_counter() - start
+    print(f"{name:<40} {duration / repeat * 1e6:10.2f} us/request")
+    return duration / repeat
+
+async def main(repeat):
+    asyncSessionMaker = None
+
+    def before():
+        return {"loaders": createLoadersAuto(asyncSessionMaker, BaseModel=BaseModel)}
+
+    def after():
+        return createLoadersContext(asyncSessionMaker)
+
+    def touch(createContext):
+        def result():
+            loaders = createContext()["loaders"]
+            for tableName in tablesUsedByRequest:
+                getattr(loaders, tableName)
+        return result
+
+    results = {
+        "before: context": measure("before: context", before, repeat),
+        "after: context": measure("after: context", after, repeat),
+        "before: context + 3 loaders": measure("before: context + 3 loaders", touch(before), repeat),
+        "after: context + 3 loaders": measure("after: context + 3 loaders", touch(after), repeat),
+    }
+    print(f"speedup (context)           {results['before: context'] / results['after: context']:.1f}x")
+    print(f"speedup (context + loaders) {results['before: context + 3 loaders'] / results['after: context + 3 loaders']:.1f}x")
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    asyncio.run(main(repeat))
@@ -0,0 +1,62 @@
+"""Porovnani dotazu loaderu na exam_results s pripojenymi relacemi a bez nich.
+
+    python -m benchmarks.bench_relation_loading [pocet_radku] [pocet_opakovani]
+
+"before" odpovida puvodnimu lazy="joined" na relacich (LEFT OUTER JOIN na exams, exam_types,
+admissions, payment_infos, student_admissions a payments), "after" je vychozi rezim loaderu
+(LOADERS_RELATION_LOADING=select), kdy se cte jen zakladni tabulka.
+"""
+import sys
+import time
+import uuid
+import asyncio
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from src.DBDefinitions import startEngine, ExamModel, ExamResultModel, ExamTypeModel, StudentAdmissionModel
+from src.utils.DBFeeder import initDB
+
+# retezec, ktery puvodne zpusobovalo lazy="joined" na modelech
+joinedBefore = [
+    joinedload(ExamResultModel.exam).joinedload(ExamModel.exam_type).joinedload(ExamTypeModel.admission).joinedload("*"),
+    joinedload(ExamResultModel.student_admission).joinedload(StudentAdmissionModel.admission).joinedload("*"),
+    joinedload(ExamResultModel.student_admission).joinedload(StudentAdmissionModel.payment).joinedload("*"),
+]
+
+async def seed(asyncSessionMaker, count):
+    async with asyncSessionMaker() as session:
+        template = (await session.execute(select(ExamResultModel).limit(1))).scalars().first()
+        session.add_all([
+            ExamResultModel(id=uuid.uuid4(), score=float(index % 100), exam_id=template.exam_id, student_admission_id=template.student_admission_id)
+            for index in range(count)
+        ])
+        await session.commit()
+
+async def measure(name, asyncSessionMaker, statement, repeat):
+    async with asyncSessionMaker() as session:
+        result = await session.execute(statement)
+        width = len(result.raw.keys())
+        rows = len(result.unique().scalars().all())
+    start = time.perf_counter()
+    for _ in range(repeat):
+        async with asyncSessionMaker() as session:
+            result = await session.execute(statement)
+            result.unique().scalars().all()
+    duration = (time.perf_counter() - start) / repeat
+    print(f"{name:<10} rows {rows:6d} columns {width:4d} {duration * 1e3:10.2f} ms/query")
+    return duration
+
+async def main(count, repeat):
+    asyncSessionMaker = await startEngine("sqlite+aiosqlite:///:memory:", makeDrop=True, makeUp=True)
+    await initDB(asyncSessionMaker)
+    await seed(asyncSessionMaker, count)
+
+    before = await measure("before", asyncSessionMaker, select(ExamResultModel).options(*joinedBefore), repeat)
+    after = await measure("after", asyncSessionMaker, select(ExamResultModel), repeat)
+    print(f"speedup {before / after:.1f}x")
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    asyncio.run(main(count, repeat))
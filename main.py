@@ -38,9 +38,11 @@
 # app.include_router(graphql_app, prefix="/gql")
 
 import os
+import uuid
+import typing
 import asyncio
-from fastapi import FastAPI, Request
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, Request, HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
 from strawberry.fastapi import GraphQLRouter
 from contextlib import asynccontextmanager
 
@@ -52,13 +54,18 @@ connectionString = ComposeConnectionString()
 
 def singleCall(asyncFunc):
     """Dekorator, ktery dovoli, aby dekorovana funkce byla volana (vycislena) jen jednou. Navratova hodnota je zapamatovana a pri dalsich volanich vracena.
-    Dekorovana funkce je asynchronni.
+    Dekorovana funkce je asynchronni. Soubezna prvni volani (lifespan a prvni dotazy) cekaji na jedine vycisleni,
+    pokud vycisleni selze, vyjimku dostane jen toto volani a dalsi (i cekajici) volani jej zkusi znovu.
+    Plati jen v ramci jednoho procesu, inicializaci dat z vice workeru resi initDB (advisoryLock a importBatch).
     """
     resultCache = {}
+    lock = asyncio.Lock()
 
     async def result():
-        if resultCache.get("result", None) is None:
-            resultCache["result"] = await asyncFunc()
+        if "result" not in resultCache:
+            async with lock:
+                if "result" not in resultCache:
+                    resultCache["result"] = await asyncFunc()
         return resultCache["result"]
 
     return result
@@ -79,17 +86,37 @@ async def RunOnceAndReturnSessionMaker():
 
     async def initDBWithReport(initizalizedEngine):
         from src.utils.DBFeeder import initDB
-        await initDB(initizalizedEngine)
+        from src.utils.Startup import reportProgress, setStartupPhase
+        from src.utils.WarmUp import warmUp, getWarmUpOptions
+        await initDB(initizalizedEngine, progress=reportProgress)
         print("data initialized", flush=True)
 
-    future = initDBWithReport(initizalizedEngine)
-    asyncio.create_task(future)
+        # worker je pripraveny az po zahrati cache, prvni dotazy po nasazeni pak nejsou vyrazne pomalejsi
+        options = getWarmUpOptions()
+        if options["enabled"]:
+            setStartupPhase("warmup")
+            try:
+                durations = await asyncio.wait_for(warmUp(schema, initizalizedEngine), options["timeout"])
+                print(f"warm up finished {durations}", flush=True)
+            except asyncio.TimeoutError:
+                print(f"warm up did not finish in {options['timeout']} s", flush=True)
+
+    from src.utils.Startup import trackStartupTask
+    # uloha je sledovana, jeji stav a postup vraci /ready
+    trackStartupTask(lambda: initDBWithReport(initizalizedEngine), phase="seeding")
     return initizalizedEngine
 
 
 async def get_context(request: Request):
     asyncSessionMaker = await RunOnceAndReturnSessionMaker()
 
+    from src.utils.Startup import getStartupGating, waitForReady, getStartupState
+    gating = getStartupGating()
+    if gating["mode"] != "off":
+        ready = await waitForReady(gating["timeout"] if gating["mode"] == "wait" else 0)
+        if not ready:
+            raise HTTPException(status_code=503, detail=getStartupState(), headers={"Retry-After": "5"})
+
     from src.utils.Dataloaders import createLoadersContext
     context = createLoadersContext(asyncSessionMaker)
     result = {**context}
@@ -99,8 +126,19 @@ async def get_context(request: Request):
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    initizalizedEngine = await RunOnceAndReturnSessionMaker()
+    from src.DBDefinitions import prewarmPool, disposeEngine
+    asyncSessionMaker = await RunOnceAndReturnSessionMaker()
+    # SQLALCHEMY_POOL_PREWARM spojeni je otevreno drive, nez worker prijme provoz
+    prewarmCount = int(os.environ.get("SQLALCHEMY_POOL_PREWARM", "0"))
+    if prewarmCount > 0:
+        opened = await prewarmPool(asyncSessionMaker, prewarmCount)
+        print(f"pool prewarmed with {opened} connections", flush=True)
     yield
+    from src.utils.Startup import cancelStartupTask
+    from src.utils.gql_ug_proxy import closeProxies
+    await cancelStartupTask()
+    await closeProxies()
+    await disposeEngine(asyncSessionMaker)
 
 
 app = FastAPI(lifespan=lifespan)
@@ -113,7 +151,76 @@ graphql_app = GraphQLRouter(
 app.include_router(graphql_app, prefix="/gql")
 
 
+@app.get("/ready")
+async def ready():
+    """Pripravenost workeru pro orchestrator: 200 po dokonceni inicializace dat, behem ni 503 se stavem a postupem,
+    500 pokud inicializace selhala i po opakovani (STARTUP_RETRIES)
+    """
+    from fastapi.responses import JSONResponse
+    from src.utils.Startup import getStartupState, isStartupFailed
+    state = getStartupState()
+    if isStartupFailed():
+        return JSONResponse(state, status_code=500)
+    return JSONResponse(state, status_code=200 if state["ready"] else 503)
+
+@app.get("/live")
+async def live():
+    """Zivost workeru pro orchestrator (liveness probe): 500 pokud inicializace selhala i po opakovani, worker je pak restartovan"""
+    from fastapi.responses import JSONResponse
+    from src.utils.Startup import getStartupState, isStartupFailed
+    return JSONResponse(getStartupState(), status_code=500 if isStartupFailed() else 200)
+
 @app.get("/voyager", response_class=FileResponse)
 async def graphiql():
     realpath = os.path.realpath("./voyager.html")
-    return realpath
\ No newline at end of file
+    return realpath
+
+@app.get("/pool")
+async def pool():
+    from src.DBDefinitions import getPoolStats
+    asyncSessionMaker = await RunOnceAndReturnSessionMaker()
+    return getPoolStats(asyncSessionMaker)
+
+@app.get("/caches")
+async def caches():
+    """Statistiky procesne sdilenych cache (velikost, hits, misses, hit_ratio)"""
+    from src.utils.WhoAmI import getIdentityCache
+    from src.utils.Dataloaders import getRowCache
+    from src.GraphTypeDefinitions.RBAC import getRBACCache
+    from src.GraphTypeDefinitions.DocumentCache import getDocumentCache
+    from src.GraphTypeDefinitions.PersistedQueries import getPersistedQueries
+    rowCache = getRowCache()
+    return {
+        "whoami": getIdentityCache().stats(),
+        "rbac": getRBACCache().stats(),
+        "documents": getDocumentCache().stats(),
+        "persisted_queries": getPersistedQueries().stats(),
+        "rows": None if rowCache is None else rowCache.stats(),
+    }
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metriky (doba operaci a resolveru, davky loaderu, statistiky cache), viz src.utils.Metrics.
+    Pri behu vice procesu (PROMETHEUS_MULTIPROC_DIR) jsou metriky agregovany pres vsechny procesy.
+    """
+    from fastapi.responses import Response
+    from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
+    from src.utils.Metrics import createMetricsRegistry
+    return Response(generate_latest(createMetricsRegistry()), media_type=CONTENT_TYPE_LATEST)
+
+@app.get("/export/student_admissions")
+async def export_student_admissions(request: Request, format: str = "ndjson", admission_id: typing.Optional[uuid.UUID] = None):
+    """Streamuje vsechny student_admissions (volitelne jen pro jedno admission) s vysledky zkousek a platbou
+    jako NDJSON nebo CSV. Plati stejna autorizace jako pro GQL (OnlyForAuthentized), identita se zjistuje
+    stejnou cestou jako v RBACExtension (viz isRequestAuthentized), bez prihlaseni 401, pri nedostupnem UG 503.
+    """
+    from src.utils.WhoAmI import isRequestAuthentized
+    from src.utils.Export import streamStudentAdmissions, exportFormats
+    if format not in exportFormats:
+        raise HTTPException(status_code=400, detail=f"unknown format {format}, use one of {list(exportFormats.keys())}")
+    if not await isRequestAuthentized(request):
+        raise HTTPException(status_code=401, detail="User is not authenticated")
+    asyncSessionMaker = await RunOnceAndReturnSessionMaker()
+    serializer, mediaType = exportFormats[format]
+    records = streamStudentAdmissions(asyncSessionMaker, admission_id=admission_id)
+    return StreamingResponse(serializer(records), media_type=mediaType)
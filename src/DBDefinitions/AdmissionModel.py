@@ -35,4 +35,4 @@ class AdmissionModel(BaseModel):
     request_enrollment_start_date: Mapped[datetime] = mapped_column(nullable= True, default=None, comment="From when its possible to ask for different date of enrollment")
     request_enrollment_end_date: Mapped[datetime] = mapped_column(nullable= True, default=None, comment="To when its possible to ask for different date of enrollment")
 
-    payment_info = relationship("PaymentInfoModel", viewonly=True, lazy="joined")
+    payment_info = relationship("PaymentInfoModel", viewonly=True)
@@ -23,4 +23,4 @@ class ExamModel(BaseModel):
     examiners_id: Mapped[uuid.UUID] = UUIDFKey("groups.id", comment="Foreign key referencing the group of examiners associated with this exam")
     facility_id: Mapped[uuid.UUID] = UUIDFKey("facilities.id", comment="Foreign key referencing the facility associated with this exam")
 
-    exam_type = relationship("ExamTypeModel", viewonly=True, lazy="joined")
\ No newline at end of file
+    exam_type = relationship("ExamTypeModel", viewonly=True)
\ No newline at end of file
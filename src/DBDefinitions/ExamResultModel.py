@@ -13,5 +13,5 @@ class ExamResultModel(BaseModel):
     exam_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("exams.id"), index=True, nullable= True, default=None, comment="Foreign key referencing the associated exam")
     student_admission_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("student_admissions.id"), index=True, nullable= True, default=None, comment="Foreign key referencing the related student admission")
 
-    exam = relationship("ExamModel", viewonly=True, lazy="joined")
-    student_admission = relationship("StudentAdmissionModel", viewonly=True, lazy="joined")
+    exam = relationship("ExamModel", viewonly=True)
+    student_admission = relationship("StudentAdmissionModel", viewonly=True)
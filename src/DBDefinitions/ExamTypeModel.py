@@ -33,4 +33,4 @@ class ExamTypeModel(BaseModel):
 
     master_exam_type = relationship("ExamTypeModel", viewonly=True)
     subexam_types = relationship("ExamTypeModel", remote_side="ExamTypeModel.id", viewonly=True, uselist=True)
-    admission = relationship("AdmissionModel", viewonly=True, lazy="joined")
+    admission = relationship("AdmissionModel", viewonly=True)
@@ -15,4 +15,4 @@ class PaymentModel(BaseModel):
     variable_symbol: Mapped[str] = mapped_column(String, default=None, nullable=True, comment="Variable symbol of transaction")
     amount: Mapped[float] = mapped_column(Float, default=None, nullable=True, comment="Paid amount of the transaction")
 
-    payment_info = relationship("PaymentInfoModel", viewonly=True, lazy="joined")
\ No newline at end of file
+    payment_info = relationship("PaymentInfoModel", viewonly=True)
\ No newline at end of file
@@ -21,5 +21,5 @@ class StudentAdmissionModel(BaseModel):
 
     payment_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("payments.id"), default=None, nullable=True, index=True, comment="Foreign key referencing to the payment associated with this student admission")
 
-    admission = relationship("AdmissionModel", viewonly=True, uselist=False, lazy="joined")
-    payment = relationship("PaymentModel", viewonly=True, uselist=False, lazy="joined")
\ No newline at end of file
+    admission = relationship("AdmissionModel", viewonly=True, uselist=False)
+    payment = relationship("PaymentModel", viewonly=True, uselist=False)
\ No newline at end of file
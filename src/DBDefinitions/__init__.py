@@ -1,6 +1,9 @@
+import time
 import sqlalchemy
+from contextlib import asynccontextmanager
 
 from sqlalchemy import create_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.orm import sessionmaker
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -22,9 +25,45 @@ from .StudentAdmissionModel import StudentAdmissionModel
 from .PaymentInfoModel import PaymentInfoModel
 from .PaymentModel import PaymentModel
 
+class MeasuredAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Pool spojeni, ktery navic meri cekani na pridelene spojeni"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.waitCount = 0
+        self.waitTimeTotal = 0.0
+        self.waitTimeMax = 0.0
+        self.timeoutCount = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except sqlalchemy.exc.TimeoutError:
+            self.timeoutCount += 1
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            self.waitCount += 1
+            self.waitTimeTotal += duration
+            self.waitTimeMax = max(self.waitTimeMax, duration)
+
+    def stats(self):
+        return {
+            "size": self.size(),
+            "checkedin": self.checkedin(),
+            "checkedout": self.checkedout(),
+            "overflow": self.overflow(),
+            "wait_count": self.waitCount,
+            "wait_time_total": self.waitTimeTotal,
+            "wait_time_avg": (self.waitTimeTotal / self.waitCount) if self.waitCount else None,
+            "wait_time_max": self.waitTimeMax,
+            "timeouts": self.timeoutCount
+        }
+
+
 async def startEngine(connectionstring, makeDrop=False, makeUp=True):
     """Provede nezbytne ukony a vrati asynchronni SessionMaker"""
-    asyncEngine = create_async_engine(connectionstring)
+    asyncEngine = create_async_engine(connectionstring, **ComposeEngineOptions(connectionstring))
 
     async with asyncEngine.begin() as conn:
         if makeDrop:
@@ -44,6 +83,65 @@ async def startEngine(connectionstring, makeDrop=False, makeUp=True):
     )
     return async_sessionMaker
 
+def getEngine(asyncSessionMaker):
+    """Vraci asynchronni engine, nad kterym je SessionMaker postaven"""
+    return asyncSessionMaker.kw["bind"]
+
+async def prewarmPool(asyncSessionMaker, count):
+    """Otevre soucasne count spojeni (kazde overi dotazem SELECT 1) a vrati je do poolu,
+    prvni dotazy po startu pak nemusi spojeni navazovat. Pocet je omezen velikosti poolu, vraci pocet otevrenych spojeni.
+    """
+    engine = getEngine(asyncSessionMaker)
+    pool = engine.pool
+    size = getattr(pool, "size", None)
+    if size is None:
+        # sqlite a pooly bez pevne velikosti
+        return 0
+    count = min(count, size())
+    if count <= 0:
+        return 0
+    connections = []
+    try:
+        for _ in range(count):
+            connection = await engine.connect()
+            connections.append(connection)
+            await connection.execute(sqlalchemy.text("SELECT 1"))
+    finally:
+        for connection in connections:
+            await connection.close()
+    return len(connections)
+
+@asynccontextmanager
+async def advisoryLock(asyncSessionMaker, key):
+    """
+    async with advisoryLock(asyncSessionMaker, key):
+        ...
+
+    Zamek mezi procesy (workery, instance pri rolling restartu) nad stejnou databazi. Na PostgreSQL
+    pg_advisory_xact_lock v transakci drzene po dobu bloku, zamek se uvolni i pri padu procesu. Jinde nic nezamyka.
+    """
+    engine = getEngine(asyncSessionMaker)
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+    async with engine.connect() as connection:
+        async with connection.begin():
+            await connection.execute(sqlalchemy.text("SELECT pg_advisory_xact_lock(:key)"), {"key": key})
+            yield
+
+async def disposeEngine(asyncSessionMaker):
+    """Uzavre vsechna spojeni poolu, volat pri ukonceni workeru"""
+    await getEngine(asyncSessionMaker).dispose()
+
+def getPoolStats(asyncSessionMaker):
+    """Vraci stav poolu spojeni enginu, nad kterym je SessionMaker postaven"""
+    pool = getEngine(asyncSessionMaker).pool
+    stats = getattr(pool, "stats", None)
+    result = {"pool": type(pool).__name__}
+    if stats is not None:
+        result.update(stats())
+    return result
+
 import os
 
 def ComposeConnectionString():
@@ -59,4 +157,30 @@ def ComposeConnectionString():
     connectionstring = f"{driver}://{user}:{password}@{hostWithPort}/{database}"
     connectionstring = os.environ.get("CONNECTION_STRING", connectionstring)
 
-    return connectionstring
\ No newline at end of file
+    return connectionstring
+
+def ComposeEngineOptions(connectionstring):
+    """Odvozuje parametry poolu spojeni z promennych prostredi.
+    SQLALCHEMY_POOL_SIZE, SQLALCHEMY_MAX_OVERFLOW, SQLALCHEMY_POOL_TIMEOUT (s),
+    SQLALCHEMY_POOL_PRE_PING ("True"/"False"), SQLALCHEMY_POOL_RECYCLE (s, -1 vypina),
+    ASYNCPG_STATEMENT_CACHE_SIZE (pocet pripravenych dotazu drzenych na spojeni).
+    Pro sqlite se pool nekonfiguruje.
+    """
+    if connectionstring.startswith("sqlite"):
+        return {}
+
+    options = {
+        "poolclass": MeasuredAsyncQueuePool,
+        "pool_size": int(os.environ.get("SQLALCHEMY_POOL_SIZE", "5")),
+        "max_overflow": int(os.environ.get("SQLALCHEMY_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.environ.get("SQLALCHEMY_POOL_TIMEOUT", "30")),
+        "pool_pre_ping": os.environ.get("SQLALCHEMY_POOL_PRE_PING", "False") in ["True", "true"],
+        "pool_recycle": int(os.environ.get("SQLALCHEMY_POOL_RECYCLE", "-1")),
+    }
+    if "+asyncpg" in connectionstring:
+        statementCacheSize = int(os.environ.get("ASYNCPG_STATEMENT_CACHE_SIZE", "100"))
+        options["connect_args"] = {
+            "prepared_statement_cache_size": statementCacheSize,
+            "statement_cache_size": statementCacheSize
+        }
+    return options
@@ -0,0 +1,72 @@
+import json
+import uuid
+import base64
+import datetime
+from sqlalchemy import and_, or_, inspect
+
+def encodeCursor(row, orderby=None):
+    """Vraci nepruhledny kurzor (retezec) ukazujici za radek `row` pri razeni dle (orderby, id).
+    Pokud row nema hodnotu orderby (napr. sloupec neni vystaven v GQL typu), vyvola ValueError.
+    """
+    value = None
+    if orderby is not None:
+        if not hasattr(row, orderby) or callable(getattr(row, orderby)):
+            raise ValueError(f"orderby={orderby} is not a column of {type(row).__name__}, it cannot be used for cursor")
+        value = getattr(row, orderby)
+    if isinstance(value, (datetime.datetime, datetime.date, uuid.UUID)):
+        value = str(value)
+    payload = json.dumps([orderby, value, str(row.id)])
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+def decodeCursor(cursor):
+    """Vraci (orderby, hodnota, id) z kurzoru vytvoreneho encodeCursor"""
+    try:
+        orderby, value, id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return orderby, value, uuid.UUID(id)
+    except Exception as e:
+        raise ValueError(f"invalid cursor {cursor}") from e
+
+def coerceValue(column, value):
+    """Prevede hodnotu z kurzoru na typ sloupce"""
+    if value is None:
+        return None
+    pythonType = column.type.python_type
+    if pythonType is datetime.datetime:
+        return datetime.datetime.fromisoformat(value)
+    if pythonType is datetime.date:
+        return datetime.date.fromisoformat(value)
+    if pythonType is uuid.UUID:
+        return uuid.UUID(value)
+    return pythonType(value)
+
+def getOrderColumn(dbModel, orderby):
+    """Vraci sloupec modelu pro razeni dle orderby, pokud orderby neni jmeno sloupce, vraci None"""
+    if (orderby is None) or (orderby not in inspect(dbModel).columns.keys()):
+        return None
+    return getattr(dbModel, orderby)
+
+def keysetOrdering(dbModel, orderby=None, desc=None):
+    """Vraci razeni pro strankovani kurzorem, (orderby, id), hodnoty NULL jsou vzdy na konci"""
+    ordering = []
+    column = getOrderColumn(dbModel, orderby)
+    if column is not None:
+        ordering.append((column.desc() if desc else column.asc()).nulls_last())
+    ordering.append(dbModel.id.desc() if desc else dbModel.id.asc())
+    return ordering
+
+def keysetFilter(dbModel, cursor, orderby=None, desc=None):
+    """Vraci podminku vybirajici radky za kurzorem pri razeni keysetOrdering, pro nezname orderby vyvola ValueError"""
+    cursorOrderby, value, id = decodeCursor(cursor)
+    if cursorOrderby != orderby:
+        raise ValueError(f"cursor was created for orderby={cursorOrderby}, got orderby={orderby}")
+    idAfter = (dbModel.id < id) if desc else (dbModel.id > id)
+    if orderby is None:
+        return idAfter
+    column = getOrderColumn(dbModel, orderby)
+    if column is None:
+        raise ValueError(f"unknown orderby={orderby} for {dbModel.__tablename__}")
+    if value is None:
+        return and_(column.is_(None), idAfter)
+    value = coerceValue(column, value)
+    columnAfter = (column < value) if desc else (column > value)
+    return or_(columnAfter, and_(column == value, idAfter), column.is_(None))
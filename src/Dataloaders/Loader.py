@@ -1,195 +1,371 @@
+import os
 import typing
+import datetime
 import functools
 from aiodataloader import DataLoader
-from sqlalchemy import select
-
-from src.DBDefinitions import BaseModel, AdmissionModel
-from strawberry.dataloader import DataLoader
-
-DBModel = typing.TypeVar("DBModel", BaseModel)
-def createLoader(asyncSessionMaker, dbModel: DBModel) -> DataLoader[str, DBModel]:
-    mainstmt = select(dbModel)
+from sqlalchemy import select, delete, func
+from sqlalchemy.orm import aliased, joinedload
+from sqlalchemy.orm.interfaces import MANYTOONE
+
+from uoishelpers.resolvers import update
+from uoishelpers.dataloaders import prepareSelect
+
+from src.utils.Metrics import LoaderBatchTimer
+from .Cursor import keysetFilter, keysetOrdering, getOrderColumn
+
+DBModel = typing.TypeVar("DBModel")
+
+
+@functools.cache
+def getRelationLoading():
+    """Vraci rezim nacitani relaci modelu v loaderech (LOADERS_RELATION_LOADING):
+        select - (vychozi) dotazy ctou jen zakladni tabulku, relace resi GQL vrstva pres loadery
+        joined - ke kazdemu dotazu jsou pripojeny (LEFT OUTER JOIN) vsechny relace many-to-one
+    """
+    mode = os.environ.get("LOADERS_RELATION_LOADING", "select")
+    assert mode in ["select", "joined"], f"LOADERS_RELATION_LOADING must be select or joined, got {mode}"
+    return mode
+
+@functools.cache
+def getRelationOptions(dbModel, mode="select"):
+    """Vraci volby dotazu pro nacteni relaci modelu v danem rezimu"""
+    if mode != "joined":
+        return ()
+    return tuple(
+        joinedload(getattr(dbModel, relation.key))
+        for relation in dbModel.__mapper__.relationships
+        if (relation.direction is MANYTOONE) and not relation.uselist
+    )
+
+def selectModel(dbModel):
+    return select(dbModel).options(*getRelationOptions(dbModel, getRelationLoading()))
+
+@functools.cache
+def getStatements(dbModel):
+    """Vraci (jednou sestavene) zakladni dotazy pro dany model"""
+    mainstmt = selectModel(dbModel)
     filtermethod = dbModel.id.in_
-
-    @functools.cache
-    def create_FKLoader(foreignKeyName=None):
-        assert foreignKeyName is not None, "foreignKeyName must be defined"
-        foreignKeyNameAttribute = getattr(dbModel, foreignKeyName)
-        mainstmt = select(dbModel).order_by(foreignKeyNameAttribute)
-        fkeyattr = getattr(dbModel, foreignKeyName)
-        filtermethod = fkeyattr.in_
-
-        class FKLoader(DataLoader[str, DBModel]):
-            async def batch_load_fn(self, keys):
-                # print('batch_load_fn', keys, flush=True)
-                async with asyncSessionMaker() as session:
-                    statement = mainstmt.filter(filtermethod(keys))
-                    rows = await session.execute(statement)
-                    rows = rows.scalars()
-                    rows = list(rows)
-                    groupedResults = dict((key, []) for key in keys)
-                    for row in rows:
-                        # print(row)
-                        foreignKeyValue = getattr(row, foreignKeyName)
-                        groupedResult = groupedResults[foreignKeyValue]
-                        groupedResult.append(row)
-
-                    # print(groupedResults)
-                    return (groupedResults.values())
-
-        return FKLoader(cache=True)
-
-    class Loader(DataLoader[str, DBModel]):
-        async def batch_load_fn(self, keys):
-            # print('batch_load_fn', keys, flush=True)
-            async with asyncSessionMaker() as session:
-                statement = mainstmt.filter(filtermethod(keys))
+    return mainstmt, filtermethod
+
+@functools.cache
+def getFKStatements(dbModel, foreignKeyName):
+    """Vraci (jednou sestavene) zakladni dotazy pro dany model a cizi klic"""
+    fkeyattr = getattr(dbModel, foreignKeyName)
+    mainstmt = selectModel(dbModel).order_by(fkeyattr)
+    filtermethod = fkeyattr.in_
+    return mainstmt, filtermethod
+
+
+class FKLoader(DataLoader):
+    """Loader, ktery pro hodnotu ciziho klice vraci seznam radku"""
+    def __init__(self, asyncSessionMaker, dbModel, foreignKeyName):
+        super().__init__(cache=True)
+        self.asyncSessionMaker = asyncSessionMaker
+        self.dbModel = dbModel
+        self.foreignKeyName = foreignKeyName
+
+    async def batch_load_fn(self, keys):
+        _keys = [*keys]
+        mainstmt, filtermethod = getFKStatements(self.dbModel, self.foreignKeyName)
+        with LoaderBatchTimer(self.dbModel.__tablename__, "fk", len(_keys)):
+            async with self.asyncSessionMaker() as session:
+                statement = mainstmt.filter(filtermethod(_keys))
                 rows = await session.execute(statement)
-                rows = rows.scalars()
-                # return rows
-                datamap = {}
-                for row in rows:
-                    datamap[row.id] = row
-                result = [datamap.get(id, None) for id in keys]
-                return result
-
-        async def insert(self, entity, extraAttributes={}):
-            newdbrow = dbModel()
-            # print("insert", newdbrow, newdbrow.id, newdbrow.name, flush=True)
-            newdbrow = update(newdbrow, entity, extraAttributes)
-            async with asyncSessionMaker() as session:
-                # print("insert", newdbrow, newdbrow.id, newdbrow.name, flush=True)
-                session.add(newdbrow)
+                rows = rows.scalars().all()
+        groupedResults = dict((key, []) for key in _keys)
+        for row in rows:
+            foreignKeyValue = getattr(row, self.foreignKeyName)
+            groupedResult = groupedResults.get(foreignKeyValue, None)
+            if groupedResult is not None:
+                groupedResult.append(row)
+        return [groupedResults[key] for key in _keys]
+
+
+class IDLoader(DataLoader):
+    """Loader radku dle primarniho klice.
+    Je-li zadan rowCache (procesne sdileny cache, viz src.utils.Cache.TTLCache),
+    je pred dotazem do databaze konzultovan a vlastni zapisy jej zneplatnuji.
+    """
+    def __init__(self, asyncSessionMaker, dbModel, rowCache=None):
+        super().__init__(cache=True)
+        self.asyncSessionMaker = asyncSessionMaker
+        self.dbModel = dbModel
+        self.tableName = dbModel.__tablename__
+        self.rowCache = rowCache
+        self.fkLoaders = {}
+        self.primedPages = {}
+
+    def getFKLoader(self, foreignKeyName):
+        result = self.fkLoaders.get(foreignKeyName, None)
+        if result is None:
+            result = FKLoader(self.asyncSessionMaker, self.dbModel, foreignKeyName)
+            self.fkLoaders[foreignKeyName] = result
+        return result
+
+    async def batch_load_fn(self, keys):
+        rowCache = self.rowCache
+        datamap = {}
+        missingKeys = keys
+        if rowCache is not None:
+            missingKeys = []
+            for key in keys:
+                row = rowCache.get((self.tableName, key))
+                if row is None:
+                    missingKeys.append(key)
+                else:
+                    datamap[key] = row
+
+        if missingKeys:
+            mainstmt, filtermethod = getStatements(self.dbModel)
+            with LoaderBatchTimer(self.tableName, "id", len(missingKeys)):
+                async with self.asyncSessionMaker() as session:
+                    statement = mainstmt.filter(filtermethod(missingKeys))
+                    rows = await session.execute(statement)
+                    rows = rows.scalars().all()
+            for row in rows:
+                datamap[row.id] = row
+                if rowCache is not None:
+                    rowCache.set((self.tableName, row.id), row)
+        return [datamap.get(key, None) for key in keys]
+
+    def invalidate(self, id):
+        """Zneplatni radek id po zapisu, vcetne stranek pripravenych page_by_fkey (zapis muze zmenit jejich obsah i poradi)"""
+        self.primedPages.clear()
+        if self.rowCache is not None:
+            self.rowCache.invalidate((self.tableName, id))
+
+    async def insert(self, entity, extraAttributes={}):
+        newdbrow = self.dbModel()
+        newdbrow = update(newdbrow, entity, extraAttributes)
+        async with self.asyncSessionMaker() as session:
+            session.add(newdbrow)
+            await session.commit()
+        self.invalidate(newdbrow.id)
+        return newdbrow
+
+    async def update(self, entity, extraValues={}):
+        self.invalidate(entity.id)
+        mainstmt, _ = getStatements(self.dbModel)
+        async with self.asyncSessionMaker() as session:
+            statement = mainstmt.filter_by(id=entity.id)
+            rows = await session.execute(statement)
+            rows = rows.scalars()
+            rowToUpdate = next(rows, None)
+
+            if rowToUpdate is None:
+                return None
+
+            dochecks = hasattr(rowToUpdate, 'lastchange')
+            checkpassed = True
+            result = None
+            if (dochecks):
+                if (entity.lastchange != rowToUpdate.lastchange):
+                    checkpassed = False
+                else:
+                    entity.lastchange = datetime.datetime.now()
+            if checkpassed:
+                rowToUpdate = update(rowToUpdate, entity, extraValues=extraValues)
                 await session.commit()
-            # self.clear(newdbrow.id)
-            # self.prime(newdbrow.id, newdbrow)
-            # print("insert", newdbrow, newdbrow.id, newdbrow.name, flush=True)
-            return newdbrow
-
-        async def update(self, entity, extraValues={}):
-            async with asyncSessionMaker() as session:
-                statement = mainstmt.filter_by(id=entity.id)
-                rows = await session.execute(statement)
-                rows = rows.scalars()
-                rowToUpdate = next(rows, None)
-
+                result = rowToUpdate
+                self.clear(result.id)
+                self.prime(result.id, result)
+        self.invalidate(entity.id)
+        return result
+
+    async def checkForeignKeys(self, session, rows):
+        """Vraci {index radku: chyba} pro radky, jejichz cizi klice odkazuji na neexistujici radky.
+        Pro kazdy cizi klic je jeden dotaz na vsechny hodnoty.
+        """
+        errors = {}
+        for foreignKey in self.dbModel.__table__.foreign_keys:
+            columnName = foreignKey.parent.key
+            values = {getattr(row, columnName, None) for row in rows} - {None}
+            if not values:
+                continue
+            targetColumn = foreignKey.column
+            existing = set(await session.scalars(select(targetColumn).filter(targetColumn.in_(values))))
+            for index, row in enumerate(rows):
+                value = getattr(row, columnName, None)
+                if (value is not None) and (value not in existing):
+                    errors.setdefault(index, f"{columnName} {value} does not exist")
+        return errors
+
+    async def insert_many(self, entities, extraAttributes={}):
+        """Vlozi radky v jedne transakci (jeden flush, INSERT ... RETURNING pro vice radku).
+        Vraci seznam ve stejnem poradi jako entities, pro kazdou entitu novy radek nebo retezec s chybou.
+        Radky s chybou (duplicitni id, neexistujici cizi klic) se nevkladaji, ostatni ano.
+        """
+        results = [None] * len(entities)
+        newdbrows = [update(self.dbModel(), entity, extraAttributes) for entity in entities]
+        async with self.asyncSessionMaker() as session:
+            ids = [row.id for row in newdbrows]
+            existing = set(await session.scalars(select(self.dbModel.id).filter(self.dbModel.id.in_(ids))))
+            errors = await self.checkForeignKeys(session, newdbrows)
+            seen = set()
+            for index, row in enumerate(newdbrows):
+                if (row.id in existing) or (row.id in seen):
+                    errors.setdefault(index, f"id {row.id} already exists")
+                seen.add(row.id)
+            valid = [(index, row) for index, row in enumerate(newdbrows) if index not in errors]
+            try:
+                session.add_all([row for _, row in valid])
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                errors.update((index, f"{e}") for index, _ in valid)
+                valid = []
+        for index, error in errors.items():
+            results[index] = error
+        for index, row in valid:
+            self.invalidate(row.id)
+            results[index] = self.registerResult(row)
+        return results
+
+    async def update_many(self, entities, extraValues={}):
+        """Aktualizuje radky v jedne transakci, lastchange (optimisticke zamykani) je kontrolovan pro kazdy radek.
+        Vraci seznam ve stejnem poradi jako entities, pro kazdou entitu aktualizovany radek nebo retezec s chybou.
+        """
+        results = [None] * len(entities)
+        mainstmt, filtermethod = getStatements(self.dbModel)
+        ids = [entity.id for entity in entities]
+        for id in ids:
+            self.invalidate(id)
+        async with self.asyncSessionMaker() as session:
+            rows = await session.scalars(mainstmt.filter(filtermethod(ids)))
+            rowsToUpdate = {row.id: row for row in rows}
+            candidates = []
+            seen = set()
+            for index, entity in enumerate(entities):
+                rowToUpdate = rowsToUpdate.get(entity.id, None)
                 if rowToUpdate is None:
-                    return None
-
-                dochecks = hasattr(rowToUpdate, 'lastchange')
-                checkpassed = True
-                # print('loaded', rowToUpdate)
-                # print('loaded', rowToUpdate.id, rowToUpdate.name)
-                if (dochecks):
-                    # print('checking', flush=True)
-                    if (entity.lastchange != rowToUpdate.lastchange):
-                        # print('checking failed', flush=True)
-                        result = None
-                        checkpassed = False
-                    else:
-                        entity.lastchange = datetime.datetime.now()
-                        # print(entity)
-                if checkpassed:
-                    rowToUpdate = update(rowToUpdate, entity, extraValues=extraValues)
-                    # print('updated', rowToUpdate.id, rowToUpdate.name, rowToUpdate.lastchange)
-                    await session.commit()
-                    # print('after commit', rowToUpdate.id, rowToUpdate.name, rowToUpdate.lastchange)
-                    # print('after commit', row.id, row.name, row.lastchange)
-                    result = rowToUpdate
-                    self.registerResult(result)
-
-                # self.clear_all()
-            # cacherow = await self.load(result.id)
-            # print("cacherow", cacherow, flush=True)
-            # print("cacherow", cacherow.name, cacherow.id, flush=True)
-            # print("cacherow", list(self._cache.keys()), flush=True)
-            # cachevalue = await self._cache.get(entity.id)
-            # print("cacherow", cachevalue.id, cachevalue.name, flush=True)
-            return result
-
-        async def delete(self, id):
-            statement = delete(dbModel).where(dbModel.id == id)
-            async with asyncSessionMaker() as session:
-                result = await session.execute(statement)
+                    results[index] = f"id {entity.id} does not exist"
+                elif entity.id in seen:
+                    results[index] = f"id {entity.id} is updated more than once"
+                elif hasattr(rowToUpdate, "lastchange") and (entity.lastchange != rowToUpdate.lastchange):
+                    results[index] = "lastchange mismatch, entity has been changed by someone else"
+                else:
+                    candidates.append((index, entity, rowToUpdate))
+                seen.add(entity.id)
+
+            errors = await self.checkForeignKeys(session, [entity for _, entity, _ in candidates])
+            now = datetime.datetime.now()
+            updated = []
+            for position, (index, entity, rowToUpdate) in enumerate(candidates):
+                if position in errors:
+                    results[index] = errors[position]
+                    continue
+                if hasattr(rowToUpdate, "lastchange"):
+                    entity.lastchange = now
+                updated.append((index, update(rowToUpdate, entity, extraValues=extraValues)))
+            try:
                 await session.commit()
-                self.clear(id)
-                return result
-
-        def registerResult(self, result):
-            self.clear(result.id)
-            self.prime(result.id, result)
+            except Exception as e:
+                await session.rollback()
+                for index, _ in updated:
+                    results[index] = f"{e}"
+                updated = []
+        for index, row in updated:
+            results[index] = self.registerResult(row)
+        for id in ids:
+            self.invalidate(id)
+        return results
+
+    async def delete(self, id):
+        self.invalidate(id)
+        statement = delete(self.dbModel).where(self.dbModel.id == id)
+        async with self.asyncSessionMaker() as session:
+            result = await session.execute(statement)
+            await session.commit()
+            self.clear(id)
             return result
 
-        def getSelectStatement(self):
-            return select(dbModel)
-
-        def getModel(self):
-            return dbModel
-
-        def getAsyncSessionMaker(self):
-            return asyncSessionMaker
-
-        async def execute_select(self, statement):
-            # print(statement)
-
-            async with asyncSessionMaker() as session:
-                rows = await session.execute(statement)
-                return (
-                    self.registerResult(row)
-                    for row in rows.scalars()
-                )
-
-        async def filter_by(self, **filters):
+    def registerResult(self, result):
+        self.clear(result.id)
+        self.prime(result.id, result)
+        if self.rowCache is not None:
+            self.rowCache.set((self.tableName, result.id), result)
+        return result
+
+    def getSelectStatement(self):
+        return selectModel(self.dbModel)
+
+    def getModel(self):
+        return self.dbModel
+
+    def getAsyncSessionMaker(self):
+        return self.asyncSessionMaker
+
+    async def execute_select(self, statement):
+        async with self.asyncSessionMaker() as session:
+            rows = await session.execute(statement)
+            return [
+                self.registerResult(row)
+                for row in rows.scalars()
+            ]
+
+    async def filter_by(self, **filters):
+        if len(filters) == 1:
+            [(key, value)] = filters.items()
+            fkeyloader = self.getFKLoader(foreignKeyName=key)
+            results = await fkeyloader.load(value)
+            return [self.registerResult(result) for result in results]
+        else:
+            mainstmt, _ = getStatements(self.dbModel)
             statement = mainstmt.filter_by(**filters)
-            # logging.debug(f"loader is executing statement {statement}")
-            # print(f"loader is executing statement {statement}", flush=True)
             return await self.execute_select(statement)
 
-        async def page(self, skip=0, limit=10, where=None, orderby=None, desc=None, extendedfilter=None):
-            if where is not None:
-                statement = prepareSelect(dbModel, where, extendedfilter)
-            elif extendedfilter is not None:
-                statement = mainstmt.filter_by(**extendedfilter)
-            else:
-                statement = mainstmt
-            statement = statement.offset(skip).limit(limit)
-            # if extendedfilter is not None:
-            #     statement = statement.filter_by(**extendedfilter)
-            if orderby is not None:
-                column = getattr(dbModel, orderby, None)
-                if column is not None:
-                    if desc:
-                        statement = statement.order_by(column.desc())
-                    else:
-                        statement = statement.order_by(column.asc())
-
-            return await self.execute_select(statement)
-
-        def set_cache(self, cache_object):
-            self.cache = True
-            self._cache = cache_object
-
-    return Loader(cache=True)
-
-
-async def exp():
-    l: DataLoader[str, AdmissionModel] = createLoader(asyncSessionMaker=None, dbModel=AdmissionModel)
-    k = createLoader(asyncSessionMaker=None, dbModel=AdmissionModel)
-    row = await k.load("x")
-    row.
-
-
-from src.DBDefinitions import BaseModel
-
-
-def createContext(baseModel: DBModel) -> dict[str, DataLoader[str, DBModel]]:
-    return {
-        baseModel: createLoader(asyncSessionMaker=None, dbModel=AdmissionModel)
-    }
-
-
-async def context_example():
-    baseModel = BaseModel
-    context = createContext(baseModel=baseModel)
-    loader = context[baseModel]
-    row = await loader.load("x")
\ No newline at end of file
+    async def page_by_fkey(self, foreignKeyName, keys, skip=0, limit=10, orderby=None, desc=None):
+        """Nacte jednim dotazem stranky radku pro vice hodnot ciziho klice (row_number() over (partition by ...)).
+        Vysledky si zapamatuje, nasledne page(extendedfilter={foreignKeyName: key}, ...) se stejnymi
+        parametry je vrati bez dalsiho dotazu do databaze.
+        """
+        keys = list(dict.fromkeys(keys))
+        result = {key: [] for key in keys}
+        if keys:
+            fkeyattr = getattr(self.dbModel, foreignKeyName)
+            orderColumn = orderby if getOrderColumn(self.dbModel, orderby) is not None else None
+            ordering = keysetOrdering(self.dbModel, orderby=orderColumn, desc=desc)
+            rownumber = func.row_number().over(partition_by=fkeyattr, order_by=ordering).label("rownumber")
+            subquery = select(self.dbModel, rownumber).filter(fkeyattr.in_(keys)).subquery()
+            entity = aliased(self.dbModel, subquery)
+            first = skip or 0
+            statement = select(entity).filter(subquery.c.rownumber > first)
+            if limit is not None:
+                statement = statement.filter(subquery.c.rownumber <= first + limit)
+            statement = statement.order_by(subquery.c.rownumber)
+            for row in await self.execute_select(statement):
+                result[getattr(row, foreignKeyName)].append(row)
+        for key, rows in result.items():
+            self.primedPages[(foreignKeyName, key, skip, limit, orderby, desc)] = rows
+        return result
+
+    async def page(self, skip=0, limit=10, where=None, orderby=None, desc=None, extendedfilter=None, after=None):
+        """Vraci stranku radku. Je-li zadan kurzor `after` (viz Cursor.encodeCursor), jsou vraceny radky
+        za nim, misto OFFSET se pouzije podminka na klic razeni (keyset).
+        Stranky jsou vzdy razeny dle (orderby, id), takze kurzor z posledniho radku stranky navazuje bez mezer.
+        """
+        if (after is None) and (where is None) and (extendedfilter is not None) and (len(extendedfilter) == 1):
+            [(key, value)] = extendedfilter.items()
+            primed = self.primedPages.get((key, value, skip, limit, orderby, desc), None)
+            if primed is not None:
+                return primed
+
+        mainstmt, _ = getStatements(self.dbModel)
+        if where is not None:
+            statement = prepareSelect(self.dbModel, where, extendedfilter)
+        elif extendedfilter is not None:
+            statement = mainstmt.filter_by(**extendedfilter)
+        else:
+            statement = mainstmt
+        if (after is None) and (getOrderColumn(self.dbModel, orderby) is None):
+            # strankovani bez kurzoru nezname orderby ignoruje (puvodni chovani), s kurzorem je to chyba
+            orderby = None
+        if after is not None:
+            statement = statement.filter(keysetFilter(self.dbModel, after, orderby=orderby, desc=desc))
+        statement = statement.order_by(*keysetOrdering(self.dbModel, orderby=orderby, desc=desc))
+        statement = statement.offset(skip).limit(limit)
+        return await self.execute_select(statement)
+
+    def set_cache(self, cache_object):
+        self.cache = True
+        self._cache = cache_object
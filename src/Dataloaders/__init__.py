@@ -1,24 +1,47 @@
-from uoishelpers.dataloaders import createIdLoader, createFkeyLoader
-from functools import cache
+import functools
 
 from src.DBDefinitions import BaseModel
+from .Loader import IDLoader, FKLoader
 
-def createLoaders(asyncSessionMaker):
+@functools.cache
+def createLoadersClass(baseModel=BaseModel):
+    """Sestavi (jednou za beh procesu) tridu kontejneru loaderu.
+    Kontejner ma pro kazdy model atributy dle __tablename__ i dle jmena tridy,
+    loader konkretni tabulky vznika az pri prvnim pristupu k atributu.
+    """
+    def createProperty(DBModel):
+        tableName = DBModel.__tablename__
+        def getLoader(self):
+            loader = self._loaders.get(tableName, None)
+            if loader is None:
+                rowCache = self._rowCache if tableName in self._cachedTables else None
+                loader = IDLoader(self._asyncSessionMaker, DBModel, rowCache=rowCache)
+                self._loaders[tableName] = loader
+            return loader
+        return property(getLoader)
 
-    def createLambda(loaderName, DBModel):
-        return lambda self: createIdLoader(asyncSessionMaker, DBModel)
+    def __init__(self, asyncSessionMaker, rowCache=None, cachedTables=frozenset()):
+        self._asyncSessionMaker = asyncSessionMaker
+        self._rowCache = rowCache
+        self._cachedTables = cachedTables
+        self._loaders = {}
 
-    attrs = {}
-
-    for DBModel in BaseModel.registry.mappers:
+    attrs = {
+        "__slots__": ("_asyncSessionMaker", "_rowCache", "_cachedTables", "_loaders"),
+        "__init__": __init__
+    }
+    for DBModel in baseModel.registry.mappers:
         cls = DBModel.class_
-        attrs[cls.__tablename__] = property(cache(createLambda(asyncSessionMaker, cls)))
+        attrs[cls.__tablename__] = createProperty(cls)
         attrs[cls.__name__] = attrs[cls.__tablename__]
     # attrs["authorizations"] = property(cache(lambda self: AuthorizationLoader()))
-    Loaders = type('Loaders', (), attrs)
-    return Loaders()
+    return type('Loaders', (), attrs)
+
+def createLoaders(asyncSessionMaker, rowCache=None, cachedTables=frozenset()):
+    Loaders = createLoadersClass(BaseModel)
+    return Loaders(asyncSessionMaker, rowCache=rowCache, cachedTables=cachedTables)
 
-def createLoadersContext(asyncSessionMaker):
+def createLoadersContext(asyncSessionMaker, rowCache=None, cachedTables=frozenset()):
     return {
-        "loaders": createLoaders(asyncSessionMaker)
-    }
\ No newline at end of file
+        "loaders": createLoaders(asyncSessionMaker, rowCache=rowCache, cachedTables=cachedTables)
+    }
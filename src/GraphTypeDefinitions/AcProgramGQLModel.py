@@ -5,7 +5,7 @@ import typing
 import strawberry.types
 
 from uoishelpers.resolvers import VectorResolver
-from uoishelpers.gqlpermissions import OnlyForAuthentized
+from .Permissions import OnlyForAuthentized
 
 AdmissionGQLModel = typing.Annotated["AdmissionGQLModel", strawberry.lazy(".AdmissionGQLModel")]
 
@@ -6,7 +6,6 @@ import strawberry
 import uuid
 
 from uoishelpers.gqlpermissions import (
-    OnlyForAuthentized,
     SimpleInsertPermission,
     SimpleUpdatePermission,
     SimpleDeletePermission
@@ -22,13 +21,14 @@ from uoishelpers.resolvers import (
     DeleteError,
     Delete,
 
-    PageResolver,
     ScalarResolver,
     VectorResolver,
 )
 
 
 from .BaseGQLModel import BaseGQLModel
+from .Permissions import OnlyForAuthentized
+from .PageResolver import PageResolver
 
 StudentAdmissionGQLModel = typing.Annotated["StudentAdmissionGQLModel", strawberry.lazy(".StudentAdmissionGQLModel")]
 ExamTypeGQLModel = typing.Annotated["ExamTypeGQLModel", strawberry.lazy(".ExamTypeGQLModel")]
@@ -228,7 +228,7 @@ admission_by_id = strawberry.field(
 
 admission_page = strawberry.field(
     description="""Returns a list of admissions""",
-    resolver=PageResolver[AdmissionGQLModel](whereType=AdmissionInputFilter),
+    resolver=PageResolver[AdmissionGQLModel](whereType=AdmissionInputFilter, eager=True),
     permission_classes=[
             OnlyForAuthentized,
     ]
@@ -2,9 +2,14 @@ from uuid import UUID
 import datetime
 import typing
 import strawberry
+import functools
 import dataclasses
 
-from uoishelpers.gqlpermissions import OnlyForAuthentized, RBACObjectGQLModel
+from uoishelpers.gqlpermissions import RBACObjectGQLModel
+
+from .Permissions import OnlyForAuthentized
+
+from src.Dataloaders.Cursor import encodeCursor
 
 UserGQLModel = typing.Annotated["UserGQLModel", strawberry.lazy(".UserGQLModel")]
 
@@ -13,6 +18,17 @@ async def resolve_reference(cls, info: strawberry.types.Info, id: UUID, **otherD
     _id = UUID(id) if isinstance(id, str) else id
     return None if id is None else cls(id=_id, **otherData)
 
+@functools.cache
+def getFieldMapper(GQLType, dbModel):
+    """Vraci (jednou sestaveny) prevodnik radku dbModel na instanci GQLType.
+    Kopiruje jen sloupce, ktere GQL typ deklaruje ve svem konstruktoru, bez rekurze a hlubokych kopii.
+    """
+    gqlNames = {field.name for field in dataclasses.fields(GQLType) if field.init}
+    names = tuple(field.name for field in dataclasses.fields(dbModel) if field.name in gqlNames)
+    def mapper(db_row):
+        return GQLType(**{name: getattr(db_row, name) for name in names})
+    return mapper
+
 @strawberry.federation.interface(
     keys=["id"], description="""Entity representing an interface"""
 )
@@ -23,9 +39,8 @@ class BaseGQLModel:
 
     @classmethod
     def from_dataclass(cls, db_row):
-        db_row_dict = dataclasses.asdict(db_row)
-        instance = cls(**db_row_dict)
-        return instance
+        mapper = getFieldMapper(cls, type(db_row))
+        return mapper(db_row)
 
     @classmethod
     async def load_with_loader(cls, info: strawberry.types.Info, id: UUID):
@@ -111,4 +126,13 @@ class BaseGQLModel:
         ]
     )
     async def rbacobject(self) -> typing.Optional["RBACObjectGQLModel"]:
-        return None if self.rbacobject_id is None else RBACObjectGQLModel(id=self.rbacobject_id)
\ No newline at end of file
+        return None if self.rbacobject_id is None else RBACObjectGQLModel(id=self.rbacobject_id)
+
+    @strawberry.field(
+        description="opaque cursor pointing behind this entity, pass it as `after` to page query with the same orderby",
+        permission_classes=[
+            OnlyForAuthentized,
+        ]
+    )
+    def cursor(self, orderby: typing.Optional[str] = None) -> str:
+        return encodeCursor(self, orderby)
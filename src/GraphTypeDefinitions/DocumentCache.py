@@ -0,0 +1,39 @@
+import functools
+
+from strawberry.extensions import SchemaExtension
+
+from src.utils.Cache import createCacheFromEnv
+from src.utils.Metrics import registerCache
+
+@functools.cache
+def getDocumentCache():
+    """Vraci procesne sdileny LRU cache rozparsovanych a zvalidovanych dokumentu, klic je text dotazu
+    (DOCUMENT_CACHE_MAXSIZE, DOCUMENT_CACHE_TTL)
+    """
+    return createCacheFromEnv("DOCUMENT_CACHE", 500, 86400)
+
+registerCache("documents", getDocumentCache)
+
+class DocumentCacheExtension(SchemaExtension):
+    """Pro dotaz, ktery uz byl jednou uspesne rozparsovan a zvalidovan, pouzije dokument z cache
+    (viz getDocumentCache) a parse i validaci preskoci. Dokumenty s chybou validace se necachuji.
+    """
+    cached = False
+
+    def on_parse(self):
+        execution_context = self.execution_context
+        if (execution_context.graphql_document is None) and execution_context.query:
+            document = getDocumentCache().get(execution_context.query)
+            if document is not None:
+                execution_context.graphql_document = document
+                self.cached = True
+        yield
+
+    def on_validate(self):
+        execution_context = self.execution_context
+        if self.cached and (execution_context.errors is None):
+            # strawberry validaci preskoci, pokud errors neni None
+            execution_context.errors = []
+        yield
+        if (not self.cached) and (not execution_context.errors) and (execution_context.graphql_document is not None) and execution_context.query:
+            getDocumentCache().set(execution_context.query, execution_context.graphql_document)
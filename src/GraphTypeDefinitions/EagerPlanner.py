@@ -0,0 +1,93 @@
+import inspect
+import functools
+import strawberry
+
+from strawberry.types.nodes import SelectedField
+
+MAXDEPTH = 8
+
+def unwrapType(type_):
+    """Vraci (GQL typ, je-li seznam) pro typ pole, odstranuje Optional, List a lazy odkazy"""
+    isList = False
+    while True:
+        typeName = type_.__class__.__name__
+        if typeName == "StrawberryOptional":
+            type_ = type_.of_type
+        elif typeName == "StrawberryList":
+            type_ = type_.of_type
+            isList = True
+        elif isinstance(type_, strawberry.LazyType):
+            type_ = type_.resolve_type()
+        else:
+            return type_, isList
+
+@functools.cache
+def getFieldIndex(GQLType, nameConverter):
+    """Index poli GQL typu dle jejich jmena v GraphQL schematu"""
+    definition = GQLType.__strawberry_definition__
+    return {nameConverter.get_graphql_name(field): field for field in definition.fields}
+
+@functools.cache
+def getRelation(field):
+    """Pro pole resene ScalarResolver / VectorResolver vraci (GQL typ, jmeno ciziho klice, je-li seznam), jinak None"""
+    resolver = field.base_resolver
+    if resolver is None:
+        return None
+    nonlocals = inspect.getclosurevars(resolver.wrapped_func).nonlocals
+    foreignKeyName = nonlocals.get("fkey_field_name", None)
+    if foreignKeyName is None:
+        return None
+    GQLType, isList = unwrapType(field.type)
+    if getattr(GQLType, "getLoader", None) is None:
+        # entita jineho prvku federace, neni v nasi databazi
+        return None
+    return GQLType, foreignKeyName, isList
+
+def intArgument(arguments, name, default):
+    # literal v dotazu (limit: 20) je v SelectedField.arguments jako retezec, promenna uz jako int
+    value = arguments.get(name, None)
+    return default if value is None else int(value)
+
+def flattenSelections(selections):
+    for selection in selections:
+        if isinstance(selection, SelectedField):
+            yield selection
+        else:
+            # FragmentSpread, InlineFragment
+            yield from flattenSelections(selection.selections)
+
+async def primeSelections(info: strawberry.types.Info, GQLType, rows, selections, depth=0):
+    """Projde vyber (selection set) nad radky `rows` typu GQLType a pro kazdou vnorenou relaci
+    nacte data vsech rodicu jednim dotazem, ktery ulozi do loaderu tohoto dotazu.
+    Resolvery vnorenych poli pak data najdou v loaderech a do databaze uz nejdou.
+    Pole s argumentem where a relace mimo nasi databazi se neplanuji, resi se standardne.
+    """
+    if (depth >= MAXDEPTH) or (not rows):
+        return
+    fieldIndex = getFieldIndex(GQLType, info.schema.config.name_converter)
+    for selection in flattenSelections(selections):
+        field = fieldIndex.get(selection.name, None)
+        if field is None:
+            continue
+        relation = getRelation(field)
+        if relation is None:
+            continue
+        childType, foreignKeyName, isList = relation
+        loader = childType.getLoader(info=info)
+        if isList:
+            arguments = selection.arguments
+            if arguments.get("where", None) is not None:
+                continue
+            groups = await loader.page_by_fkey(
+                foreignKeyName,
+                [row.id for row in rows],
+                skip=intArgument(arguments, "skip", 0),
+                limit=intArgument(arguments, "limit", 10),
+                orderby=arguments.get("orderby", None)
+            )
+            childRows = [row for group in groups.values() for row in group]
+        else:
+            ids = {getattr(row, foreignKeyName, None) for row in rows}
+            ids.discard(None)
+            childRows = [row for row in await loader.load_many(list(ids)) if row is not None]
+        await primeSelections(info, childType, childRows, selection.selections, depth=depth + 1)
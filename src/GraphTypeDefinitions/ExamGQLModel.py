@@ -6,7 +6,6 @@ import strawberry
 import uuid
 
 from uoishelpers.gqlpermissions import (
-    OnlyForAuthentized,
     SimpleInsertPermission,
     SimpleUpdatePermission,
     SimpleDeletePermission
@@ -22,13 +21,14 @@ from uoishelpers.resolvers import (
     DeleteError,
     Delete,
 
-    PageResolver,
     VectorResolver,
     ScalarResolver,
 )
 
 
 from .BaseGQLModel import BaseGQLModel
+from .Permissions import OnlyForAuthentized
+from .PageResolver import PageResolver
 
 StudentAdmissionGQLModel = typing.Annotated["StudentAdmissionGQLModel", strawberry.lazy(".StudentAdmissionGQLModel")]
 ExamResultGQLModel = typing.Annotated["ExamResultGQLModel", strawberry.lazy(".ExamResultGQLModel")]
@@ -6,7 +6,6 @@ import strawberry
 import uuid
 
 from uoishelpers.gqlpermissions import (
-    OnlyForAuthentized,
     SimpleInsertPermission,
     SimpleUpdatePermission,
     SimpleDeletePermission
@@ -22,13 +21,15 @@ from uoishelpers.resolvers import (
     DeleteError,
     Delete,
 
-    PageResolver,
     VectorResolver,
     ScalarResolver,
 )
 
 
 from .BaseGQLModel import BaseGQLModel
+from .Permissions import OnlyForAuthentized
+from .PageResolver import PageResolver
+from .ManyResolvers import InsertMany, UpdateMany, SimpleInsertManyPermission, SimpleUpdateManyPermission
 
 ExamGQLModel = typing.Annotated["ExamGQLModel", strawberry.lazy(".ExamGQLModel")]
 StudentAdmissionGQLModel = typing.Annotated["StudentAdmissionGQLModel", strawberry.lazy(".StudentAdmissionGQLModel")]
@@ -168,6 +169,30 @@ async def exam_result_update(self, info: strawberry.types.Info, exam_result: typ
 
 
 
+@strawberry.mutation(
+    description="Adds many exam results in one transaction, returns inserted result or error for each of them.",
+    permission_classes=[
+        OnlyForAuthentized,
+        SimpleInsertManyPermission[ExamResultGQLModel](roles=["administrátor", "administrátor přijímacího řízení"])
+    ]
+)
+async def exam_results_insert_many(self, info: strawberry.types.Info, exam_results: typing.List[ExamResultInsertGQLModel]) -> typing.List[typing.Union[ExamResultGQLModel, InsertError[ExamResultGQLModel]]]:
+    return await InsertMany[ExamResultGQLModel].DoItSafeWay(info=info, entities=exam_results)
+
+
+
+@strawberry.mutation(
+    description="Updates many exam results in one transaction, lastchange is checked for each of them, returns updated result or error for each of them.",
+    permission_classes=[
+        OnlyForAuthentized,
+        SimpleUpdateManyPermission[ExamResultGQLModel](roles=["administrátor", "administrátor přijímacího řízení"])
+    ]
+)
+async def exam_results_update_many(self, info: strawberry.types.Info, exam_results: typing.List[ExamResultUpdateGQLModel]) -> typing.List[typing.Union[ExamResultGQLModel, UpdateError[ExamResultGQLModel]]]:
+    return await UpdateMany[ExamResultGQLModel].DoItSafeWay(info=info, entities=exam_results)
+
+
+
 @strawberry.mutation(
     description="Deletes admission using stefek magic.",
     permission_classes=[
@@ -6,7 +6,6 @@ import strawberry
 import uuid
 
 from uoishelpers.gqlpermissions import (
-    OnlyForAuthentized,
     SimpleInsertPermission,
     SimpleUpdatePermission,
     SimpleDeletePermission
@@ -22,13 +21,14 @@ from uoishelpers.resolvers import (
     DeleteError,
     Delete,
 
-    PageResolver,
     ScalarResolver,
     VectorResolver,
 )
 
 
 from .BaseGQLModel import BaseGQLModel
+from .Permissions import OnlyForAuthentized
+from .PageResolver import PageResolver
 
 AdmissionGQLModel = typing.Annotated["AdmissionGQLModel", strawberry.lazy(".AdmissionGQLModel")]
 ExamGQLModel = typing.Annotated["ExamGQLModel", strawberry.lazy(".ExamGQLModel")]
@@ -5,7 +5,7 @@ import typing
 import strawberry.types
 
 from uoishelpers.resolvers import VectorResolver
-from uoishelpers.gqlpermissions import OnlyForAuthentized
+from .Permissions import OnlyForAuthentized
 
 ExamGQLModel = typing.Annotated["ExamGQLModel", strawberry.lazy(".ExamGQLModel")]
 
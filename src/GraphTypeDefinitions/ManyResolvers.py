@@ -0,0 +1,94 @@
+import uuid
+
+from functools import cache
+from uoishelpers.gqlpermissions import SimpleInsertPermission, SimpleUpdatePermission
+from uoishelpers.resolvers import getUserFromInfo, InsertError, UpdateError
+
+class InsertMany:
+    """
+    InsertMany[ExamResultGQLModel].DoItSafeWay(info=info, entities=exam_results)
+
+    Obdoba Insert z uoishelpers pro seznam entit. Vse se ulozi v jedne transakci (loader.insert_many),
+    vysledkem je seznam stejne delky jako vstup, na miste kazde entity je vlozena entita nebo InsertError.
+    """
+    type_arg = None
+
+    @classmethod
+    @cache
+    def __class_getitem__(cls, item):
+        new_cls = type(f"{cls.__name__}[{item.__name__}]", (cls,), {"type_arg": item})
+        return new_cls
+
+    @classmethod
+    async def DoItSafeWay(cls, info, entities):
+        type_arg = cls.type_arg
+        try:
+            loader = type_arg.getLoader(info=info)
+            actinguser = getUserFromInfo(info)
+            id = uuid.UUID(actinguser["id"])
+            for entity in entities:
+                if hasattr(entity, "rbacobject_id") and (entity.rbacobject_id is None):
+                    entity.rbacobject_id = id
+                if getattr(entity, "id", None) is None:
+                    entity.id = uuid.uuid4()
+                entity.createdby_id = id
+            rows = await loader.insert_many(entities)
+        except Exception as e:
+            return [InsertError[type_arg](msg=f"{e}", _input=entity) for entity in entities]
+        return [
+            InsertError[type_arg](msg=row, _input=entity) if isinstance(row, str) else type_arg.from_dataclass(row)
+            for entity, row in zip(entities, rows)
+        ]
+
+class UpdateMany:
+    """
+    UpdateMany[ExamResultGQLModel].DoItSafeWay(info=info, entities=exam_results)
+
+    Obdoba Update z uoishelpers pro seznam entit. Vse se ulozi v jedne transakci (loader.update_many),
+    lastchange je kontrolovan pro kazdou entitu zvlast,
+    vysledkem je seznam stejne delky jako vstup, na miste kazde entity je aktualizovana entita nebo UpdateError.
+    """
+    type_arg = None
+
+    @classmethod
+    @cache
+    def __class_getitem__(cls, item):
+        new_cls = type(f"{cls.__name__}[{item.__name__}]", (cls,), {"type_arg": item})
+        return new_cls
+
+    @classmethod
+    async def DoItSafeWay(cls, info, entities):
+        type_arg = cls.type_arg
+        loader = type_arg.getLoader(info=info)
+        try:
+            actinguser = getUserFromInfo(info)
+            id = uuid.UUID(actinguser["id"])
+            for entity in entities:
+                entity.changedby_id = id
+            rows = await loader.update_many(entities)
+        except Exception as e:
+            rows = [f"{e}"] * len(entities)
+        errorIds = [entity.id for entity, row in zip(entities, rows) if isinstance(row, str)]
+        currentRows = dict(zip(errorIds, await loader.load_many(errorIds)))
+        return [
+            UpdateError[type_arg](
+                _entity=None if currentRows.get(entity.id, None) is None else type_arg.from_dataclass(currentRows[entity.id]),
+                msg=row,
+                _input=entity
+            ) if isinstance(row, str) else type_arg.from_dataclass(row)
+            for entity, row in zip(entities, rows)
+        ]
+
+class SimpleInsertManyPermission(SimpleInsertPermission):
+    """SimpleInsertPermission pro mutace se seznamem entit, pri odmitnuti vraci InsertError pro kazdou entitu"""
+    def on_unauthorized(self):
+        cls = type(self)
+        values = next(iter(self.kwargs.values()), None) or []
+        return [InsertError[cls.type_arg](msg=f"user must have one of roles: {cls.roles}", _input=value) for value in values]
+
+class SimpleUpdateManyPermission(SimpleUpdatePermission):
+    """SimpleUpdatePermission pro mutace se seznamem entit, pri odmitnuti vraci UpdateError pro kazdou entitu"""
+    def on_unauthorized(self):
+        cls = type(self)
+        values = next(iter(self.kwargs.values()), None) or []
+        return [UpdateError[cls.type_arg](msg=f"user must have one of roles: {cls.roles}", _input=value) for value in values]
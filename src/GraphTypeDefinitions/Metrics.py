@@ -0,0 +1,51 @@
+import time
+
+from graphql import OperationDefinitionNode
+from strawberry.extensions import SchemaExtension
+
+from src.utils.Metrics import operationDuration, operationErrors, resolverDuration, isResolverSampled
+
+def getOperationLabels(execution_context):
+    """Vraci (typ, jmeno) operace, jmeno operace bez nazvu je "anonymous" """
+    operationType = "unknown"
+    operationName = execution_context.operation_name
+    document = execution_context.graphql_document
+    if document is not None:
+        for definition in document.definitions:
+            if not isinstance(definition, OperationDefinitionNode):
+                continue
+            name = None if definition.name is None else definition.name.value
+            if (operationName is None) or (name == operationName):
+                operationType = definition.operation.value
+                operationName = name
+                break
+    return operationType, operationName or "anonymous"
+
+class MetricsExtension(SchemaExtension):
+    """Prometheus metriky (viz src.utils.Metrics a /metrics):
+    doba kazde operace a doba asynchronnich resolveru (PageResolver, VectorResolver, ScalarResolver a dalsich).
+    Synchronni resolvery (atributy) se nemeri, asynchronni jen u podilu METRICS_RESOLVER_SAMPLE_RATE volani.
+    Strawberry pouziva pro resolve stale prvni instanci rozsireni, proto se o mereni rozhoduje pri kazdem volani.
+    """
+    def on_operation(self):
+        start = time.perf_counter()
+        yield
+        execution_context = self.execution_context
+        labels = getOperationLabels(execution_context)
+        operationDuration.labels(*labels).observe(time.perf_counter() - start)
+        result = execution_context.result
+        if execution_context.errors or ((result is not None) and result.errors):
+            operationErrors.labels(*labels).inc()
+
+    def resolve(self, _next, root, info, *args, **kwargs):
+        result = _next(root, info, *args, **kwargs)
+        if info.is_awaitable(result) and isResolverSampled():
+            return self.timed(result, info.parent_type.name, info.field_name)
+        return result
+
+    async def timed(self, awaitable, typeName, fieldName):
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            resolverDuration.labels(typeName, fieldName).observe(time.perf_counter() - start)
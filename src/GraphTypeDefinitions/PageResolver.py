@@ -0,0 +1,49 @@
+import typing
+import strawberry
+
+from .EagerPlanner import primeSelections
+
+T = typing.TypeVar("GQLModel")
+class PageResolver(typing.Generic[T]):
+    """
+    PageResolver[UserGQLModel](whereType=UserFilterGQLModel)
+    PageResolver[UserGQLModel](whereType=UserFilterGQLModel, eager=True)
+
+    Shodne s PageResolver z uoishelpers, navic prijima kurzor `after` (pole cursor posledni entity
+    predchozi stranky) pro strankovani bez OFFSET. S eager=True navic pred vracenim vysledku
+    projde vyber vnorenych poli a data vsech urovni nacte predem (viz EagerPlanner.primeSelections).
+    """
+    @classmethod
+    def __class_getitem__(cls, item):
+        listType = item
+        initialized = False
+        def resolveResultType(info: strawberry.types.Info):
+            return_type = info.return_type
+            if (return_type.__class__.__name__ == "StrawberryOptional"):
+                return_type = return_type.of_type
+
+            if (return_type.__class__.__name__ == "StrawberryList"):
+                return_type = return_type.of_type
+
+            if (isinstance(return_type, strawberry.LazyType)):
+                return_type = return_type.resolve_type()
+
+            nonlocal listType
+            listType = return_type
+            nonlocal initialized
+            initialized = True
+            return return_type
+
+        def result(*, whereType, eager=False):
+            async def resolver(self, info: strawberry.Info, skip: typing.Optional[int]=0, limit: typing.Optional[int]=10, orderby: typing.Optional[str]=None, where: typing.Optional[whereType]=None, after: typing.Optional[str]=None) -> typing.List[listType]:
+                if not initialized: resolveResultType(info=info)
+                loader = listType.getLoader(info=info)
+                where = None if where is None else strawberry.asdict(where)
+                results = await loader.page(skip=skip, limit=limit, orderby=orderby, where=where, after=after)
+                if eager:
+                    results = list(results)
+                    for selectedField in info.selected_fields:
+                        await primeSelections(info, listType, results, selectedField.selections)
+                return (listType.from_dataclass(result) for result in results)
+            return resolver
+        return result
@@ -0,0 +1,39 @@
+import os
+import strawberry
+
+from strawberry.types.base import StrawberryList
+
+def isAuthentized(info: strawberry.types.Info):
+    """Vraci verdikt, zda je dotaz autentizovan (DEMO rezim nebo uzivatel v kontextu).
+    Verdikt se vypocte jednou za dotaz a je ulozen v kontextu pod klicem "authentized".
+    """
+    context = info.context
+    verdict = context.get("authentized", None)
+    if verdict is None:
+        if os.getenv("DEMO", None) == "True":
+            verdict = True
+        else:
+            user = context.get("user", None)
+            if user is None:
+                request = context.get("request", None)
+                scope = getattr(request, "scope", None) or {}
+                user = scope.get("user", None)
+            verdict = user is not None
+        context["authentized"] = verdict
+    return verdict
+
+class OnlyForAuthentized(strawberry.permission.BasePermission):
+    """Nahrada OnlyForAuthentized z uoishelpers se stejnym pravidlem.
+    Kontrola je synchronni a jen cte verdikt z kontextu (viz isAuthentized), pole bez resolveru
+    tak zustavaji synchronni a pro kazde pole kazdeho radku nevznika korutina.
+    """
+    message = "User is not authenticated"
+
+    def has_permission(self, source, info: strawberry.types.Info, **kwargs) -> bool:
+        if isAuthentized(info):
+            return True
+        self.defaultResult = [] if info._field.type.__class__ == StrawberryList else None
+        return False
+
+    def on_unauthorized(self):
+        return self.defaultResult
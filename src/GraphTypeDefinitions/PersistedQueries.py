@@ -0,0 +1,74 @@
+import os
+import json
+import hashlib
+import functools
+
+from graphql import GraphQLError
+from strawberry.extensions import SchemaExtension
+
+from src.utils.Cache import createCacheFromEnv
+from src.utils.Metrics import registerCache
+
+def queryHash(query):
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+@functools.cache
+def getPersistedQueries():
+    """Vraci procesne sdileny registr persistovanych dotazu, klic je sha256 textu dotazu,
+    hodnota je (text dotazu, rozparsovany a zvalidovany dokument).
+    Velikost a doba drzeni nepouzivaneho dotazu: PERSISTED_QUERIES_MAXSIZE, PERSISTED_QUERIES_TTL,
+    PERSISTED_QUERIES_FILE je json {hash: dotaz} s dotazy, ktere jsou v registru od startu.
+    """
+    result = createCacheFromEnv("PERSISTED_QUERIES", 1000, 86400)
+    filename = os.environ.get("PERSISTED_QUERIES_FILE", None)
+    if filename:
+        with open(filename, "r", encoding="utf-8") as f:
+            for hash, query in json.load(f).items():
+                assert queryHash(query) == hash, f"persisted query {hash} does not match its sha256"
+                # dokument bude zvalidovan pri prvnim pouziti
+                result.set(hash, (query, None))
+    return result
+
+registerCache("persisted_queries", getPersistedQueries)
+
+class PersistedQueryExtension(SchemaExtension):
+    """Persistovane dotazy dle protokolu APQ (extensions.persistedQuery.sha256Hash).
+    Klient posle jen hash, a dotaz je vzat z registru (viz getPersistedQueries) i s jiz rozparsovanym
+    a zvalidovanym dokumentem, parse ani validace se pak neprovadi. Pro neznamy hash vraci chybu
+    PersistedQueryNotFound, klient pak posle hash i s dotazem a dotaz je po uspesne validaci ulozen.
+    """
+    persistedHash = None
+
+    def on_operation(self):
+        execution_context = self.execution_context
+        persistedQuery = (execution_context.operation_extensions or {}).get("persistedQuery", None)
+        if persistedQuery is not None:
+            hash = persistedQuery.get("sha256Hash", None)
+            if hash is None:
+                raise GraphQLError("PersistedQuery must have sha256Hash")
+            registry = getPersistedQueries()
+            if execution_context.query:
+                if queryHash(execution_context.query) != hash:
+                    raise GraphQLError("provided sha does not match query", extensions={"code": "PERSISTED_QUERY_HASH_MISMATCH"})
+                if hash not in registry:
+                    # ulozi se az po uspesne validaci
+                    self.persistedHash = hash
+            else:
+                entry = registry.get(hash)
+                if entry is None:
+                    raise GraphQLError("PersistedQueryNotFound", extensions={"code": "PERSISTED_QUERY_NOT_FOUND"})
+                (query, document) = entry
+                execution_context.query = query
+                if document is None:
+                    self.persistedHash = hash
+                else:
+                    execution_context.graphql_document = document
+                    # dokument uz byl zvalidovan, strawberry validaci preskoci, pokud errors neni None
+                    execution_context.errors = []
+        yield
+
+    def on_validate(self):
+        yield
+        execution_context = self.execution_context
+        if (self.persistedHash is not None) and (not execution_context.errors) and (execution_context.graphql_document is not None):
+            getPersistedQueries().set(self.persistedHash, (execution_context.query, execution_context.graphql_document))
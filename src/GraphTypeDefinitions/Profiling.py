@@ -0,0 +1,98 @@
+import os
+import time
+import uuid
+import functools
+
+from strawberry.extensions import SchemaExtension
+
+@functools.cache
+def getProfilingOptions():
+    """Vraci nastaveni profilovani z promennych prostredi:
+        PROFILING_HEADER - hlavicka, kterou si klient profilovani vyzada, jeji hodnota je format (text, html, speedscope)
+        PROFILING_ROLES - role (oddelene ;), ktere smi profilovani vyzadat
+        PROFILING_DIR - adresar, do ktereho se vystup uklada, bez nej je vystup v odpovedi (extensions.profile)
+        PROFILING_INTERVAL - perioda vzorkovani (s)
+    """
+    roles = os.environ.get("PROFILING_ROLES", "administrátor")
+    return {
+        "header": os.environ.get("PROFILING_HEADER", "x-profile").lower(),
+        "roles": frozenset(role.strip() for role in roles.split(";") if role.strip()),
+        "dir": os.environ.get("PROFILING_DIR", None),
+        "interval": float(os.environ.get("PROFILING_INTERVAL", "0.001")),
+    }
+
+profilingFormats = {
+    "text": ("txt", lambda profiler: profiler.output_text(unicode=True, color=False)),
+    "html": ("html", lambda profiler: profiler.output_html()),
+    "speedscope": ("speedscope.json", lambda profiler: profiler.output(renderer=getSpeedscopeRenderer())),
+}
+
+def getSpeedscopeRenderer():
+    from pyinstrument.renderers import SpeedscopeRenderer
+    return SpeedscopeRenderer()
+
+def hasProfilingRole(user, roles):
+    for role in (user or {}).get("roles", None) or []:
+        name = (role.get("roletype", None) or {}).get("name", None)
+        if name in roles:
+            return True
+    return False
+
+running = {"profiler": None}
+
+class ProfilingExtension(SchemaExtension):
+    """Profiluje provedeni dotazu pomoci pyinstrument, pokud si to klient vyzada hlavickou PROFILING_HEADER
+    a ma nekterou z roli PROFILING_ROLES. Ostatni dotazy neplati nic krome cteni hlavicky.
+    Profiluje se nejvyse jeden dotaz najednou, soubezne vyzadane profilovani je odmitnuto (extensions.profile.error).
+    Musi byt v schema.extensions az za RBACExtension, ktera do kontextu vklada uzivatele.
+    """
+    report = None
+
+    def on_execute(self):
+        options = getProfilingOptions()
+        context = self.execution_context.context
+        request = context.get("request", None)
+        format = None if request is None else request.headers.get(options["header"], None)
+        if not format:
+            yield
+            return
+
+        if format not in profilingFormats:
+            self.report = {"error": f"unknown profile format {format}, use one of {list(profilingFormats.keys())}"}
+            yield
+            return
+        if not hasProfilingRole(context.get("user", None), options["roles"]):
+            self.report = {"error": "profiling is not allowed for this user"}
+            yield
+            return
+        if running["profiler"] is not None:
+            self.report = {"error": "another request is being profiled"}
+            yield
+            return
+
+        from pyinstrument import Profiler
+        profiler = Profiler(interval=options["interval"], async_mode="enabled")
+        running["profiler"] = profiler
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            running["profiler"] = None
+        self.report = self.storeReport(profiler, format, options["dir"])
+
+    def storeReport(self, profiler, format, directory):
+        suffix, render = profilingFormats[format]
+        output = render(profiler)
+        if directory is None:
+            return {"format": format, "output": output}
+        operationName = self.execution_context.operation_name or "anonymous"
+        filename = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{operationName}-{uuid.uuid4().hex[:8]}.{suffix}")
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(output)
+        return {"format": format, "file": filename}
+
+    def get_results(self):
+        if self.report is None:
+            return {}
+        return {"profile": self.report}
@@ -0,0 +1,163 @@
+import os
+import asyncio
+import weakref
+import functools
+
+from graphql import (
+    GraphQLError,
+    FieldNode,
+    FragmentSpreadNode,
+    OperationDefinitionNode,
+    FragmentDefinitionNode,
+    VariableNode,
+    get_named_type,
+    get_nullable_type,
+    is_list_type,
+    is_composite_type,
+    value_from_ast_untyped,
+)
+from strawberry.extensions import SchemaExtension
+
+@functools.cache
+def getCostLimits():
+    """Vraci limity ceny dotazu z promennych prostredi:
+        QUERY_MAX_COST - dotaz s vyssim odhadem ceny je odmitnut
+        QUERY_MAX_DEPTH - dotaz s vyssi hloubkou vnoreni je odmitnut
+        QUERY_THROTTLE_COST - dotazy s vyssim odhadem ceny se provadeji nejvyse QUERY_THROTTLE_CONCURRENCY najednou
+        QUERY_DEFAULT_LIST_SIZE - predpokladana delka seznamu, pokud pole nema argument limit
+    """
+    return {
+        "maxCost": int(os.environ.get("QUERY_MAX_COST", "50000")),
+        "maxDepth": int(os.environ.get("QUERY_MAX_DEPTH", "10")),
+        "throttleCost": int(os.environ.get("QUERY_THROTTLE_COST", "5000")),
+        "throttleConcurrency": int(os.environ.get("QUERY_THROTTLE_CONCURRENCY", "2")),
+        "defaultListSize": int(os.environ.get("QUERY_DEFAULT_LIST_SIZE", "10")),
+    }
+
+# klicem je event loop, polozka zanikne se smyckou (testy, asyncio.run v nastrojich)
+throttles = weakref.WeakKeyDictionary()
+
+def getThrottle(concurrency):
+    """Semafor pro drahe dotazy, jeden pro kazdy event loop"""
+    loop = asyncio.get_running_loop()
+    result = throttles.get(loop, None)
+    if result is None:
+        result = asyncio.Semaphore(concurrency)
+        throttles[loop] = result
+    return result
+
+def getListSize(fieldDefinition, fieldNode, variables, defaultListSize):
+    """Vraci predpokladany pocet prvku seznamu: argument limit z dotazu (literal nebo promenna), jeho vychozi hodnota, nebo defaultListSize"""
+    for argument in fieldNode.arguments:
+        if argument.name.value == "limit":
+            if isinstance(argument.value, VariableNode):
+                value = variables.get(argument.value.name.value, None)
+            else:
+                value = value_from_ast_untyped(argument.value)
+            if isinstance(value, int):
+                return value
+    limitDefinition = fieldDefinition.args.get("limit", None)
+    if limitDefinition is not None:
+        default = limitDefinition.default_value
+        if isinstance(default, int):
+            return default
+    return defaultListSize
+
+def estimateCost(schema, document, operationName=None, variables=None, defaultListSize=10):
+    """Odhadne cenu dotazu jako pocet objektu, ktere muze vratit (kazdy seznam se nasobi svym limitem),
+    a hloubku vnoreni poli s objekty. Vraci (cena, hloubka).
+    """
+    variables = variables or {}
+    fragments = {}
+    operation = None
+    for definition in document.definitions:
+        if isinstance(definition, FragmentDefinitionNode):
+            fragments[definition.name.value] = definition
+        elif isinstance(definition, OperationDefinitionNode):
+            if (operationName is None) or (definition.name is not None and definition.name.value == operationName):
+                operation = operation or definition
+    if operation is None:
+        return 0, 0
+
+    rootType = schema.get_root_type(operation.operation)
+    if rootType is None:
+        return 0, 0
+
+    def visit(selectionSet, parentType, multiplier, depth):
+        cost = 0
+        maxDepth = depth
+        for selection in selectionSet.selections:
+            if isinstance(selection, FieldNode):
+                name = selection.name.value
+                fields = getattr(parentType, "fields", None) or {}
+                fieldDefinition = fields.get(name, None)
+                if fieldDefinition is None:
+                    # __typename a pole introspekce
+                    continue
+                fieldType = get_named_type(fieldDefinition.type)
+                if not is_composite_type(fieldType) or selection.selection_set is None:
+                    continue
+                count = multiplier
+                if is_list_type(get_nullable_type(fieldDefinition.type)):
+                    count = multiplier * getListSize(fieldDefinition, selection, variables, defaultListSize)
+                childCost, childDepth = visit(selection.selection_set, fieldType, count, depth + 1)
+                cost = cost + count + childCost
+                maxDepth = max(maxDepth, childDepth)
+            else:
+                if isinstance(selection, FragmentSpreadNode):
+                    fragment = fragments.get(selection.name.value, None)
+                    if fragment is None:
+                        continue
+                    typeCondition = fragment.type_condition
+                    selectionSet = fragment.selection_set
+                else:
+                    # InlineFragmentNode
+                    typeCondition = selection.type_condition
+                    selectionSet = selection.selection_set
+                fragmentType = parentType if typeCondition is None else schema.get_type(typeCondition.name.value)
+                childCost, childDepth = visit(selectionSet, fragmentType, multiplier, depth)
+                cost = cost + childCost
+                maxDepth = max(maxDepth, childDepth)
+        return cost, maxDepth
+
+    return visit(operation.selection_set, rootType, 1, 0)
+
+class QueryCostExtension(SchemaExtension):
+    """Po validaci odhadne cenu dotazu (viz estimateCost).
+    Dotazy nad QUERY_MAX_COST nebo QUERY_MAX_DEPTH odmitne, dotazy nad QUERY_THROTTLE_COST pousti jen omezene soubezne.
+    Cena a hloubka jsou v odpovedi v extensions.cost.
+    """
+    cost = None
+    depth = None
+
+    def on_validate(self):
+        yield
+        execution_context = self.execution_context
+        if execution_context.errors or (execution_context.graphql_document is None):
+            return
+        limits = getCostLimits()
+        self.cost, self.depth = estimateCost(
+            execution_context.schema._schema,
+            execution_context.graphql_document,
+            operationName=execution_context.operation_name,
+            variables=execution_context.variables,
+            defaultListSize=limits["defaultListSize"]
+        )
+        # vyjimka ukonci zpracovani dotazu pred jeho provedenim, schema ji vrati jako chybu
+        if self.cost > limits["maxCost"]:
+            raise GraphQLError(f"Query is too expensive, estimated cost {self.cost} exceeds {limits['maxCost']}")
+        if self.depth > limits["maxDepth"]:
+            raise GraphQLError(f"Query is too deep, depth {self.depth} exceeds {limits['maxDepth']}")
+
+    async def on_execute(self):
+        limits = getCostLimits()
+        if (self.cost is not None) and (self.cost > limits["throttleCost"]):
+            async with getThrottle(limits["throttleConcurrency"]):
+                yield
+        else:
+            yield
+
+    def get_results(self):
+        if self.cost is None:
+            return {}
+        return {"cost": {"estimated": self.cost, "depth": self.depth}}
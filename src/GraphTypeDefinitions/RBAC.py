@@ -0,0 +1,129 @@
+import json
+import uuid
+import functools
+import strawberry
+
+from aiodataloader import DataLoader
+from uoishelpers.schema import WhoAmIExtension
+from uoishelpers.schema.WhoAmIExtension import apolloQuery, graphiQLQuery
+
+from src.utils.Cache import createCacheFromEnv
+from src.utils.Metrics import registerCache
+from src.utils.WhoAmI import getJWT, whoAmI
+from src.utils.gql_ug_proxy import getUGClient
+
+@functools.cache
+def getRBACCache():
+    """Vraci procesne sdileny cache rozhodnuti o opravneni, klic je (user_id, rbacobject_id, role) (RBAC_CACHE_MAXSIZE, RBAC_CACHE_TTL)"""
+    return createCacheFromEnv("RBAC_CACHE", 10000, 30)
+
+registerCache("rbac", getRBACCache)
+
+# klice uzivatele ve sdilenem cache pro dotazy bez id uzivatele, nemohou se potkat s id
+anonymousUserKey = ("anonymous",)
+serviceUserKey = ("service",)
+
+def getCacheKey(struct):
+    return (str(struct["id"]), tuple(struct["roles"]))
+
+class RBACLoader(DataLoader):
+    """Loader rozhodnuti userCanWithoutState pro dvojice {"id": rbacobject_id, "roles": [jmena roli]}.
+    Vsechny dotazy jedne davky jsou poslany na UG jednim dotazem s aliasy,
+    rozhodnuti jsou drzena i ve sdilenem cache (viz getRBACCache) pro daneho uzivatele.
+    Bez user_id je pouzit klic anonymousUserKey. Chybna nebo neuplna odpoved UG se vyhodnoti jako zamitnuti,
+    ale do sdileneho cache se neuklada.
+    """
+    def __init__(self, gqlclient, user_id=anonymousUserKey, cache=None):
+        self.gqlclient = gqlclient
+        self.user_id = user_id
+        self.sharedCache = cache
+        super().__init__(
+            get_cache_key=getCacheKey
+        )
+
+    def sharedCacheKey(self, struct):
+        return (self.user_id, *getCacheKey(struct))
+
+    async def batch_load_fn(self, structlist):
+        results = {}
+        missing = []
+        for struct in structlist:
+            judgement = None
+            if self.sharedCache is not None:
+                judgement = self.sharedCache.get(self.sharedCacheKey(struct))
+            if judgement is None:
+                missing.append(struct)
+            else:
+                results[getCacheKey(struct)] = judgement
+
+        if missing:
+            index = {
+                f'h{uuid.uuid4().hex}': item
+                for item in missing
+            }
+            lines = [
+                f'{key}: rbacById(id: "{value["id"]}")'
+                '{'
+                f'judgement: userCanWithoutState(rolesNeeded: {json.dumps(list(value["roles"]), ensure_ascii=False)})'
+                '}'
+                for key, value in index.items()
+            ]
+            query = '{' + "\n".join(lines) + '}'
+            response = await self.gqlclient(query=query) or {}
+            responsedata = response.get("data", None) or {}
+            # pri chybe dotazu muze byt cast rozhodnuti neplatna, nic z odpovedi se necachuje
+            cacheable = (self.sharedCache is not None) and not response.get("errors", None)
+            for key, struct in index.items():
+                judgement = (responsedata.get(key, None) or {}).get("judgement", None)
+                results[getCacheKey(struct)] = bool(judgement)
+                if cacheable and (judgement is not None):
+                    self.sharedCache.set(self.sharedCacheKey(struct), bool(judgement))
+
+        return [results[getCacheKey(struct)] for struct in structlist]
+
+class RBACExtension(WhoAmIExtension):
+    """WhoAmIExtension, ktera identitu uzivatele bere z procesne sdileneho cache (viz src.utils.WhoAmI.getIdentity)
+    a navic pripravi kontext pro RBACLoader prihlaseneho uzivatele (viz getRBACLoaderFromInfo).
+    Dotazy na UG jdou pres sdilenou proxy (viz getUGClient), spojeni jsou znovu pouzivana.
+    """
+    def getJWT(self):
+        return getJWT(self.execution_context.context["request"])
+
+    async def ug_query(self, query, variables={}):
+        return await getUGClient(self.getJWT())(query=query, variables=variables)
+
+    async def on_execute(self):
+        query = self.execution_context.query
+        context = self.execution_context.context
+        # serviceUser vklada jen kod serveru pro interni dotazy (viz src.utils.WarmUp), z requestu se nastavit neda
+        serviceUser = context.get("serviceUser", None)
+        if serviceUser is not None:
+            whoami = serviceUser
+        elif query not in [apolloQuery, graphiQLQuery]:
+            whoami = await whoAmI(context["request"])
+        else:
+            whoami = {}
+        context["user"] = whoami
+        # verdikt OnlyForAuthentized plati pro tohoto uzivatele, viz Permissions.isAuthentized
+        context.pop("authentized", None)
+        context["ug_client"] = self.ug_query
+        userKey = (whoami or {}).get("id", None)
+        if userKey is None:
+            userKey = anonymousUserKey if serviceUser is None else serviceUserKey
+        # RBACLoader vytvori az prvni pouziti (getRBACLoaderFromInfo), Simple*Permission se na UG neptaji
+        context["rbacUserKey"] = userKey
+        context.pop("RBACLoader", None)
+        yield
+
+def getRBACLoaderFromInfo(info: strawberry.types.Info):
+    """Vraci RBACLoader pro uzivatele dotazu, vytvori ho pri prvnim pouziti v dotazu"""
+    context = info.context
+    result = context.get("RBACLoader", None)
+    if result is None:
+        assert "rbacUserKey" in context, "RBACLoader needs user in context, is RBACExtension configured properly?"
+        result = context["RBACLoader"] = RBACLoader(
+            gqlclient=context["ug_client"],
+            user_id=context["rbacUserKey"],
+            cache=getRBACCache()
+        )
+    return result
@@ -0,0 +1,23 @@
+from strawberry.extensions import SchemaExtension
+
+from src.utils.SQLStats import isSQLStatsEnabled, collectSQLStats
+
+class SQLStatsExtension(SchemaExtension):
+    """Ve vyvojovem rezimu (viz isSQLStatsEnabled) vraci v extensions.sql pocet SQL prikazu,
+    jejich celkovou dobu a pocet nactenych radku pro celou operaci, vcetne davek loaderu.
+    Slouzi k odhaleni N+1 dotazu v novych resolverech.
+    """
+    stats = None
+
+    def on_operation(self):
+        if not isSQLStatsEnabled():
+            yield
+            return
+        with collectSQLStats() as stats:
+            yield
+        self.stats = stats
+
+    def get_results(self):
+        if self.stats is None:
+            return {}
+        return {"sql": self.stats.asDict()}
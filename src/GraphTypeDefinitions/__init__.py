@@ -69,6 +69,10 @@ class Mutation:
     exam_result_insert = exam_result_insert
     exam_result_update = exam_result_update
     exam_result_delete = exam_result_delete
+
+    from .ExamResultGQLModel import exam_results_insert_many, exam_results_update_many
+    exam_results_insert_many = exam_results_insert_many
+    exam_results_update_many = exam_results_update_many
     
     from .ExamGQLModel import exam_insert, exam_update, exam_delete
     exam_insert = exam_insert
@@ -103,54 +107,21 @@ schema = strawberry.federation.Schema(
     extensions=[]
 )
 
-from uoishelpers.schema import WhoAmIExtension, ProfilingExtension, PrometheusExtension
-schema.extensions.append(WhoAmIExtension)
-# schema.extensions.append(ProfilingExtension())
-# schema.extensions.append(PyInstrument())
-# schema.extensions.append(PrometheusExtension(prefix="gql_facilities"))
-
-from aiodataloader import DataLoader
-import uuid
-
-
-def getCacheKey(struct):
-    return struct["id"]
-
-class RBACLoader(DataLoader):
-    def __init__(self, gqlclient):
-        self.index = {}
-        self.gqlclient = gqlclient
-        super().__init__(
-            get_cache_key=getCacheKey
-        )
-
-    async def batch_load_fn(self, structlist):
-        index = {
-            f'h{uuid.uuid4().hex}': item
-            for item in structlist
-        }
-        lines = [
-            f'{key}: rbacById(id: "{value["id"]}")'
-            '{'
-            f'judgement: userCanWithoutState(rolesNeeded: {value["roles"]})'
-            '}'
-            for key, value in index
-        ]
-        query = '{' + "\n".join(lines) + '}'
-        gqlclient = self.gqlclient
-        response = await gqlclient(query=query)
-        assert "data" in response, f"get bad response while asking for RBAC {response}"
-        responsedata = response["data"]
-        result = [
-            responsedata[key]["judgement"]
-            for key in index.keys()
-        ]
-        return result
-
-class RBACExtension(WhoAmIExtension):
-    async def on_execute(self):
-        self.execution_context.context["RBACLoader"] = RBACLoader(gqlclient=self.ug_query)
-
-        # print("->on_execute", self.execution_context.query, flush=True)
-        yield
-        # print("on_execute->", whoami, flush=True)
\ No newline at end of file
+from .Metrics import MetricsExtension
+# prvni, aby doba operace zahrnovala i ostatni rozsireni
+schema.extensions.append(MetricsExtension)
+from .SQLStats import SQLStatsExtension
+schema.extensions.append(SQLStatsExtension)
+from .RBAC import RBACExtension
+# RBACExtension je WhoAmIExtension s cache identit, RBACLoader (dotazy rbacById na UG) vznika az pri pouziti
+# v getRBACLoaderFromInfo, zadne pole ho zatim nepouziva (Simple*Permission kontroluji role lokalne)
+schema.extensions.append(RBACExtension)
+from .QueryCost import QueryCostExtension
+schema.extensions.append(QueryCostExtension)
+from .PersistedQueries import PersistedQueryExtension
+schema.extensions.append(PersistedQueryExtension)
+from .DocumentCache import DocumentCacheExtension
+schema.extensions.append(DocumentCacheExtension)
+from .Profiling import ProfilingExtension
+# az za RBACExtension, profilovat smi jen uzivatel s roli z PROFILING_ROLES
+schema.extensions.append(ProfilingExtension)
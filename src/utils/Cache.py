@@ -0,0 +1,70 @@
+import os
+import time
+from collections import OrderedDict
+
+sentinel = "c0b5f1f4-6c4e-4d8e-9a55-3a1f3c5e8b21"
+
+class TTLCache:
+    """Ohraniceny LRU cache, jehoz polozky po `ttl` sekundach expiruji.
+    Je urcen pro sdileni v ramci jednoho procesu (workeru), neni thread-safe,
+    pocita se s pouzitim z jedne asyncio smycky.
+    """
+    def __init__(self, maxsize=1000, ttl=60.0, timer=time.monotonic):
+        assert maxsize > 0, "maxsize must be positive"
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.data)
+
+    def __contains__(self, key):
+        return self.get(key, sentinel, count=False) is not sentinel
+
+    def get(self, key, default=None, count=True):
+        item = self.data.get(key, None)
+        if item is None:
+            if count: self.misses += 1
+            return default
+        (expiresAt, value) = item
+        if expiresAt <= self.timer():
+            del self.data[key]
+            if count: self.misses += 1
+            return default
+        self.data.move_to_end(key)
+        if count: self.hits += 1
+        return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        self.data[key] = (self.timer() + ttl, value)
+        self.data.move_to_end(key)
+        while len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+        return value
+
+    def invalidate(self, key):
+        self.data.pop(key, None)
+
+    def clear(self):
+        self.data.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self.data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / total) if total else None
+        }
+
+def createCacheFromEnv(prefix, defaultSize, defaultTTL):
+    """Vytvori TTLCache, velikost a doba platnosti (s) jsou z promennych prostredi {prefix}_MAXSIZE a {prefix}_TTL"""
+    maxsize = int(os.environ.get(f"{prefix}_MAXSIZE", str(defaultSize)))
+    ttl = float(os.environ.get(f"{prefix}_TTL", str(defaultTTL)))
+    return TTLCache(maxsize=maxsize, ttl=ttl)
@@ -1,12 +1,16 @@
 import os
 import json
+import logging
 import datetime
 import uuid
-from uoishelpers.feeders import ImportModels
+import sqlalchemy
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 
 from src.DBDefinitions import (
     AdmissionModel, StudentAdmissionModel, ExamTypeModel, ExamModel, ExamResultModel,
-    PaymentModel, PaymentInfoModel
+    PaymentModel, PaymentInfoModel,
+    advisoryLock
 )
 
 
@@ -48,7 +52,233 @@ def readJsonFile(jsonFileName):
 def get_demodata(filename="./systemdata.json"):
     return readJsonFile(filename)
 
-async def initDB(asyncSessionMaker, filename="./systemdata.json"):
+def streamJsonRows(f, chunkSize=1 << 16):
+    """Postupne cte soubor {"tablename": [{...}, ...], ...} a generuje (tablename, radek).
+    V pameti je vzdy jen jeden radek a nacteny kus souboru, soubor muze byt libovolne velky.
+    """
+    decoder = json.JSONDecoder()
+    state = {"buffer": "", "position": 0, "eof": False}
+
+    def fill():
+        chunk = f.read(chunkSize)
+        if not chunk:
+            state["eof"] = True
+            return False
+        state["buffer"] = state["buffer"][state["position"]:] + chunk
+        state["position"] = 0
+        return True
+
+    def peek():
+        while True:
+            buffer, position = state["buffer"], state["position"]
+            while position < len(buffer) and buffer[position] in " \t\r\n":
+                position = position + 1
+            state["position"] = position
+            if position < len(buffer):
+                return buffer[position]
+            if not fill():
+                return None
+
+    def expect(char):
+        found = peek()
+        if found != char:
+            raise ValueError(f"unexpected {found!r} in json stream, expected {char!r}")
+        state["position"] = state["position"] + 1
+
+    def decode():
+        peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(state["buffer"], state["position"])
+                state["position"] = end
+                return value
+            except json.JSONDecodeError:
+                # hodnota je jeste neuplna, je treba docist dalsi kus souboru
+                if not fill():
+                    raise
+
+    expect("{")
+    if peek() == "}":
+        return
+    while True:
+        tableName = decode()
+        expect(":")
+        expect("[")
+        if peek() == "]":
+            state["position"] = state["position"] + 1
+        else:
+            while True:
+                row = decode()
+                assert isinstance(row, dict), f"rows of {tableName} must be json objects"
+                yield tableName, row
+                if peek() == ",":
+                    state["position"] = state["position"] + 1
+                else:
+                    expect("]")
+                    break
+        if peek() == ",":
+            state["position"] = state["position"] + 1
+        else:
+            expect("}")
+            return
+
+def toDateTime(value):
+    return datetime.datetime.fromisoformat(value).replace(tzinfo=None)
+
+def toDate(value):
+    return datetime.date.fromisoformat(value[:10])
+
+booleanValues = {"true": True, "false": False, "1": True, "0": False}
+
+def toBoolean(value):
+    """bool z json (true/false) ponecha, retezce "true", "false", "1", "0" a cisla 1, 0 prevede, jinak ValueError"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in booleanValues:
+        return booleanValues[value.strip().lower()]
+    raise ValueError(f"{value!r} is not a boolean")
+
+def toUUID(value):
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(value)
+
+def getColumnConverters(DBModel):
+    """Vraci {jmeno sloupce: prevod hodnoty z json} odvozene z typu sloupcu modelu (jednou pro tabulku)"""
+    result = {}
+    for column in DBModel.__table__.columns:
+        columnType = column.type
+        if isinstance(columnType, sqlalchemy.DateTime):
+            converter = toDateTime
+        elif isinstance(columnType, sqlalchemy.Date):
+            converter = toDate
+        elif isinstance(columnType, sqlalchemy.Uuid):
+            converter = toUUID
+        elif isinstance(columnType, sqlalchemy.Float):
+            converter = float
+        elif isinstance(columnType, sqlalchemy.Boolean):
+            converter = toBoolean
+        elif isinstance(columnType, sqlalchemy.Integer):
+            converter = int
+        else:
+            converter = None
+        result[column.name] = converter
+    return result
+
+def convertRow(tableName, converters, row, rejected=None):
+    """Vybere z radku jen sloupce modelu a prevede jejich hodnoty, hodnoty None vynecha (uplatni se vychozi hodnoty).
+    Hodnota, kterou nelze prevest, je vynechana a zapocitana do rejected {"tabulka.sloupec": pocet},
+    prvni odmitnuta hodnota kazdeho sloupce je zalogovana.
+    """
+    result = {}
+    for name, value in row.items():
+        if (value is None) or (name not in converters):
+            continue
+        converter = converters[name]
+        if converter is not None:
+            try:
+                value = converter(value)
+            except (ValueError, TypeError, AttributeError):
+                key = f"{tableName}.{name}"
+                if rejected is not None:
+                    rejected[key] = rejected.get(key, 0) + 1
+                    if rejected[key] > 1:
+                        continue
+                logging.warning(f"import rejected value {key}: {value!r}")
+                continue
+        result[name] = value
+    return result
+
+async def insertMissing(asyncSessionMaker, DBModel, rows):
+    ids = [row["id"] for row in rows if "id" in row]
+    async with asyncSessionMaker() as session:
+        async with session.begin():
+            existing = set((await session.execute(select(DBModel.id).where(DBModel.id.in_(ids)))).scalars())
+            # add_all, unit of work seradi i radky odkazujici do stejne tabulky (master_exam_type_id)
+            session.add_all([DBModel(**row) for row in rows if row.get("id", None) not in existing])
+
+async def importBatch(asyncSessionMaker, DBModel, rows):
+    """Ulozi radky, ktere v tabulce jeste nejsou (dle id), existujici radky se nemeni.
+    Pokud stejna data soucasne nahrava jiny proces (vice workeru, rolling restart), davka muze skoncit IntegrityError,
+    pak jsou radky ulozeny po jednom a radky, ktere mezitim vlozil jiny proces, jsou preskoceny.
+    """
+    try:
+        await insertMissing(asyncSessionMaker, DBModel, rows)
+        return
+    except IntegrityError:
+        pass
+    for row in rows:
+        try:
+            await insertMissing(asyncSessionMaker, DBModel, [row])
+        except IntegrityError:
+            async with asyncSessionMaker() as session:
+                stored = (await session.execute(select(DBModel.id).where(DBModel.id == row.get("id", None)))).scalar()
+            if stored is None:
+                # chyba neni zpusobena soubeznym vlozenim tehoz radku
+                raise
+
+def checkTableOrder(filename, DBModels):
+    """Proudove projde soubor a overi, ze tabulky DBModels jsou v nem ve stejnem poradi jako v DBModels
+    (poradi dle cizich klicu), jinak vyvola ValueError. Nic se nezapisuje, pamet neroste s velikosti souboru.
+    """
+    order = dict((DBModel.__tablename__, index) for index, DBModel in enumerate(DBModels))
+    lastTableName, lastIndex = None, -1
+    with open(filename, "r", encoding="utf-8") as f:
+        for tableName, _ in streamJsonRows(f):
+            index = order.get(tableName, None)
+            if (index is None) or (tableName == lastTableName):
+                continue
+            if index < lastIndex:
+                raise ValueError(f"{filename}: table {tableName} must precede {lastTableName} (order of DBModels)")
+            lastTableName, lastIndex = tableName, index
+
+async def importJsonFile(asyncSessionMaker, DBModels, filename, batchSize=1000, progress=None):
+    """Proudove nahraje soubor {"tablename": [radky]} do tabulek DBModels. Tabulky musi byt v souboru v poradi
+    DBModels (cizi klice), poradi je overeno pred zapisem (checkTableOrder). Radky ukladane po davkach batchSize, jiz existujici id se preskakuji.
+    Typy hodnot se odvozuji ze sloupcu modelu (viz getColumnConverters), odmitnute hodnoty (viz convertRow) jsou na konci
+    zalogovany souhrnne. Vraci {"rows": {tablename: pocet prectenych radku}, "rejected": {"tabulka.sloupec": pocet}}.
+    progress(tablename, pocet) je volan po ulozeni kazde davky.
+    """
+    checkTableOrder(filename, DBModels)
+    modelIndex = dict((DBModel.__tablename__, DBModel) for DBModel in DBModels)
+    converterIndex = {}
+    counts = {}
+    rejected = {}
+    batch = []
+    batchModel = None
+
+    with open(filename, "r", encoding="utf-8") as f:
+        for tableName, row in streamJsonRows(f):
+            DBModel = modelIndex.get(tableName, None)
+            if DBModel is None:
+                continue
+            if (DBModel is not batchModel) or (len(batch) >= batchSize):
+                if batch:
+                    await importBatch(asyncSessionMaker, batchModel, batch)
+                    if progress is not None:
+                        progress(batchModel.__tablename__, counts[batchModel.__tablename__])
+                batch = []
+                batchModel = DBModel
+            converters = converterIndex.get(tableName, None)
+            if converters is None:
+                converters = converterIndex[tableName] = getColumnConverters(DBModel)
+            batch.append(convertRow(tableName, converters, row, rejected))
+            counts[tableName] = counts.get(tableName, 0) + 1
+    if batch:
+        await importBatch(asyncSessionMaker, batchModel, batch)
+        if progress is not None:
+            progress(batchModel.__tablename__, counts[batchModel.__tablename__])
+    if rejected:
+        logging.warning(f"import of {filename} rejected values {rejected}")
+    return {"rows": counts, "rejected": rejected}
+
+# klic zamku initDB, viz advisoryLock
+initDBLockKey = 0x61646d69
+
+async def initDB(asyncSessionMaker, filename="./systemdata.json", progress=None):
+    """Nahraje systemdata.json (jiz existujici radky preskoci). Soubezne initDB z vice procesu nad PostgreSQL
+    se stridaji (advisoryLock), na ostatnich databazich je soubeh osetren v importBatch.
+    """
 
     #DEMODATA = os.environ.get("DEMODATA", None) in ["True", "true"]
     DEMODATA = True
@@ -65,6 +295,6 @@ async def initDB(asyncSessionMaker, filename="./systemdata.json"):
     else:
         dbModels = []
 
-    jsonData = get_demodata(filename=filename)
-    await ImportModels(asyncSessionMaker, dbModels, jsonData)
-    pass
\ No newline at end of file
+    batchSize = int(os.environ.get("DBFEEDER_BATCH_SIZE", "1000"))
+    async with advisoryLock(asyncSessionMaker, initDBLockKey):
+        return await importJsonFile(asyncSessionMaker, dbModels, filename, batchSize=batchSize, progress=progress)
@@ -1,8 +1,29 @@
-from uoishelpers.dataloaders import createLoadersAuto
-from src.DBDefinitions import BaseModel
+import os
+import functools
+from src.Dataloaders import createLoaders, createLoadersClass
+from .Cache import createCacheFromEnv
+from .Metrics import registerCache
+
+@functools.cache
+def getRowCache():
+    """Vraci procesne sdileny cache radku (klic je (tablename, id)) nebo None, pokud neni povolen.
+    Cache zapina ROWCACHE_ENABLED ("True"), velikost a platnost je ROWCACHE_MAXSIZE, ROWCACHE_TTL.
+    """
+    enabled = os.environ.get("ROWCACHE_ENABLED", "False") in ["True", "true"]
+    if not enabled:
+        return None
+    return createCacheFromEnv("ROWCACHE", 10000, 30)
+
+registerCache("rows", getRowCache)
+
+@functools.cache
+def getRowCacheTables():
+    """Vraci mnozinu tabulek, jejichz radky jsou drzeny v procesne sdilenem cache (ROWCACHE_TABLES, oddeleno carkou)"""
+    tables = os.environ.get("ROWCACHE_TABLES", "admissions,exam_types,payment_infos")
+    return frozenset(table.strip() for table in tables.split(",") if table.strip())
 
 def createLoadersContext(asyncSessionMaker):
     return {
-        # "loaders": createLoaders(asyncSessionMaker)
-        "loaders": createLoadersAuto(asyncSessionMaker, BaseModel=BaseModel)
-    }
\ No newline at end of file
+        # "loaders": createLoadersAuto(asyncSessionMaker, BaseModel=BaseModel)
+        "loaders": createLoaders(asyncSessionMaker, rowCache=getRowCache(), cachedTables=getRowCacheTables())
+    }
@@ -0,0 +1,92 @@
+import io
+import csv
+import json
+
+from sqlalchemy import select, inspect
+
+from src.DBDefinitions import StudentAdmissionModel, ExamResultModel, PaymentModel
+
+def getColumnNames(dbModel):
+    return [attribute.key for attribute in inspect(dbModel).column_attrs]
+
+def rowToDict(row, columnNames):
+    return {name: getattr(row, name) for name in columnNames}
+
+async def streamStudentAdmissions(asyncSessionMaker, admission_id=None, batchSize=500):
+    """Asynchronni generator zaznamu student_admissions s vnorenymi payment a exam_results.
+    Zakladni tabulka je ctena kurzorem na strane serveru (stream_scalars) po davkach velikosti batchSize,
+    pro kazdou davku jsou jednim dotazem dotazeny vysledky zkousek a platby.
+    V pameti je tak vzdy jen jedna davka (identity map session drzi radky jen slabymi odkazy).
+    """
+    studentAdmissionColumns = getColumnNames(StudentAdmissionModel)
+    examResultColumns = getColumnNames(ExamResultModel)
+    paymentColumns = getColumnNames(PaymentModel)
+
+    statement = select(StudentAdmissionModel).order_by(StudentAdmissionModel.id).execution_options(yield_per=batchSize)
+    if admission_id is not None:
+        statement = statement.filter(StudentAdmissionModel.admission_id == admission_id)
+
+    async with asyncSessionMaker() as session, asyncSessionMaker() as lookupSession:
+        rows = await session.stream_scalars(statement)
+        async for batch in rows.partitions(batchSize):
+            studentAdmissionIds = [row.id for row in batch]
+            paymentIds = list({row.payment_id for row in batch if row.payment_id is not None})
+
+            examResults = {id: [] for id in studentAdmissionIds}
+            examResultRows = await lookupSession.scalars(
+                select(ExamResultModel)
+                .filter(ExamResultModel.student_admission_id.in_(studentAdmissionIds))
+                .order_by(ExamResultModel.id)
+            )
+            for examResult in examResultRows:
+                examResults[examResult.student_admission_id].append(rowToDict(examResult, examResultColumns))
+
+            payments = {}
+            if paymentIds:
+                paymentRows = await lookupSession.scalars(select(PaymentModel).filter(PaymentModel.id.in_(paymentIds)))
+                payments = {payment.id: rowToDict(payment, paymentColumns) for payment in paymentRows}
+
+            for row in batch:
+                record = rowToDict(row, studentAdmissionColumns)
+                record["payment"] = payments.get(row.payment_id, None)
+                record["exam_results"] = examResults[row.id]
+                yield record
+
+async def toNDJSON(records):
+    """Prevadi zaznamy na radky NDJSON"""
+    async for record in records:
+        yield json.dumps(record, default=str) + "\n"
+
+async def toCSV(records):
+    """Prevadi zaznamy na radky CSV, jeden radek pro kazdy vysledek zkousky (student bez vysledku ma jeden radek),
+    sloupce jsou student_admission.*, payment.* a exam_result.*
+    """
+    prefixes = [
+        ("student_admission", getColumnNames(StudentAdmissionModel)),
+        ("payment", getColumnNames(PaymentModel)),
+        ("exam_result", getColumnNames(ExamResultModel)),
+    ]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        value = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return value
+
+    writer.writerow([f"{prefix}.{name}" for prefix, names in prefixes for name in names])
+    yield flush()
+    [(_, studentAdmissionColumns), (_, paymentColumns), (_, examResultColumns)] = prefixes
+    async for record in records:
+        studentAdmission = [record[name] for name in studentAdmissionColumns]
+        payment = record["payment"] or {}
+        payment = [payment.get(name, None) for name in paymentColumns]
+        for examResult in record["exam_results"] or [{}]:
+            writer.writerow(studentAdmission + payment + [examResult.get(name, None) for name in examResultColumns])
+        yield flush()
+
+exportFormats = {
+    "ndjson": (toNDJSON, "application/x-ndjson"),
+    "csv": (toCSV, "text/csv"),
+}
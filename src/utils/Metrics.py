@@ -0,0 +1,115 @@
+import os
+import time
+import random
+import functools
+
+from prometheus_client import Histogram, Counter
+from prometheus_client.core import GaugeMetricFamily, CounterMetricFamily, REGISTRY
+
+PREFIX = os.environ.get("METRICS_PREFIX", "gql_admissions")
+
+operationDuration = Histogram(
+    f"{PREFIX}_operation_duration_seconds",
+    "Duration of GraphQL operations",
+    ["operation_type", "operation_name"],
+)
+operationErrors = Counter(
+    f"{PREFIX}_operation_errors_total",
+    "GraphQL operations finished with errors",
+    ["operation_type", "operation_name"],
+)
+resolverDuration = Histogram(
+    f"{PREFIX}_resolver_duration_seconds",
+    "Duration of async resolvers (sampled, see METRICS_RESOLVER_SAMPLE_RATE)",
+    ["type_name", "field_name"],
+    buckets=(.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5),
+)
+loaderBatchSize = Histogram(
+    f"{PREFIX}_loader_batch_size",
+    "Number of keys in one loader batch",
+    ["table", "loader"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+)
+loaderBatchDuration = Histogram(
+    f"{PREFIX}_loader_batch_duration_seconds",
+    "Duration of SQL query of one loader batch",
+    ["table", "loader"],
+    buckets=(.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5),
+)
+
+@functools.cache
+def getResolverSampleRate():
+    """Podil mereni resolveru (METRICS_RESOLVER_SAMPLE_RATE, 0..1), mereni kazdeho resolveru neni zadarmo"""
+    return float(os.environ.get("METRICS_RESOLVER_SAMPLE_RATE", "0.1"))
+
+def isResolverSampled():
+    rate = getResolverSampleRate()
+    return (rate >= 1.0) or (random.random() < rate)
+
+class LoaderBatchTimer:
+    """
+    with LoaderBatchTimer("exam_results", "id", len(keys)):
+        ...
+
+    Zaznamena velikost davky a dobu jejiho nacteni
+    """
+    def __init__(self, table, loader, size):
+        self.labels = (table, loader)
+        self.size = size
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        loaderBatchSize.labels(*self.labels).observe(self.size)
+        loaderBatchDuration.labels(*self.labels).observe(time.perf_counter() - self.start)
+        return False
+
+caches = {}
+
+def registerCache(name, getCache):
+    """Zaregistruje cache (TTLCache nebo funkci, ktera ho vraci) pro export jeho statistik do /metrics"""
+    caches[name] = getCache
+
+class CacheCollector:
+    """Kolektor statistik registrovanych cache, hodnoty se ctou az pri sberu metrik.
+    S pid jsou rady oznaceny stitkem pid (cache jsou v pameti kazdeho procesu zvlast, viz createMetricsRegistry).
+    """
+    def __init__(self, pid=None):
+        self.pid = pid
+
+    def collect(self):
+        labels = ["cache"] if self.pid is None else ["cache", "pid"]
+        extra = [] if self.pid is None else [str(self.pid)]
+        size = GaugeMetricFamily(f"{PREFIX}_cache_size", "Number of items in cache", labels=labels)
+        ratio = GaugeMetricFamily(f"{PREFIX}_cache_hit_ratio", "Cache hit ratio", labels=labels)
+        hits = CounterMetricFamily(f"{PREFIX}_cache_hits", "Cache hits", labels=labels)
+        misses = CounterMetricFamily(f"{PREFIX}_cache_misses", "Cache misses", labels=labels)
+        for name, getCache in caches.items():
+            cache = getCache() if callable(getCache) else getCache
+            if cache is None:
+                continue
+            stats = cache.stats()
+            size.add_metric([name, *extra], stats["size"])
+            ratio.add_metric([name, *extra], stats["hit_ratio"] or 0.0)
+            hits.add_metric([name, *extra], stats["hits"])
+            misses.add_metric([name, *extra], stats["misses"])
+        yield size
+        yield ratio
+        yield hits
+        yield misses
+
+REGISTRY.register(CacheCollector())
+
+def createMetricsRegistry():
+    """Vraci registr pro /metrics. Pri behu vice procesu (PROMETHEUS_MULTIPROC_DIR) agreguje metriky vsech procesu
+    (MultiProcessCollector) a pridava statistiky cache procesu, ktery dotaz obslouzil (stitek pid).
+    """
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR", None):
+        return REGISTRY
+    from prometheus_client import CollectorRegistry, multiprocess
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(CacheCollector(pid=os.getpid()))
+    return registry
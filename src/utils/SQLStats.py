@@ -0,0 +1,82 @@
+import os
+import time
+import functools
+import contextvars
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+sqlStatsVar = contextvars.ContextVar("sqlStats", default=None)
+
+class SQLStats:
+    """Pocitadla SQL prikazu jednoho useku kodu (typicky jedne GQL operace), viz collectSQLStats"""
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+        self.rows = 0
+
+    def asDict(self):
+        return {
+            "statements": self.statements,
+            "duration_ms": round(self.seconds * 1000, 3),
+            "rows": self.rows,
+        }
+
+@functools.cache
+def isSQLStatsEnabled():
+    """SQL_STATS ("True") zapina vraceni statistik SQL v odpovedi, vychozi hodnota odpovida DEMO"""
+    return os.environ.get("SQL_STATS", os.environ.get("DEMO", "False")) in ["True", "true"]
+
+def beforeCursorExecute(conn, cursor, statement, parameters, context, executemany):
+    if sqlStatsVar.get() is not None:
+        conn.info.setdefault("sqlStatsStart", []).append(time.perf_counter())
+
+def afterCursorExecute(conn, cursor, statement, parameters, context, executemany):
+    stats = sqlStatsVar.get()
+    if stats is None:
+        return
+    starts = conn.info.get("sqlStatsStart", None)
+    stats.statements += 1
+    if starts:
+        stats.seconds += time.perf_counter() - starts.pop()
+
+def onLoad(target, context):
+    stats = sqlStatsVar.get()
+    if stats is not None:
+        stats.rows += 1
+
+@functools.cache
+def installSQLStats():
+    """Zaregistruje (jednou pro proces) posluchace udalosti SQLAlchemy, ktere plni SQLStats aktivni v aktualnim kontextu.
+    Mimo collectSQLStats stoji kazdy prikaz jen cteni ContextVar.
+    """
+    from src.DBDefinitions import BaseModel
+    event.listen(Engine, "before_cursor_execute", beforeCursorExecute)
+    event.listen(Engine, "after_cursor_execute", afterCursorExecute)
+    # radky jsou pocitany jako nactene ORM entity
+    event.listen(BaseModel, "load", onLoad, propagate=True)
+    return True
+
+@contextmanager
+def collectSQLStats():
+    """
+    with collectSQLStats() as stats:
+        ...
+    print(stats.statements, stats.seconds, stats.rows)
+
+    Pocita SQL prikazy, jejich dobu a nactene radky vsech uloh spustenych v tomto kontextu (vcetne davek loaderu).
+    Vnorene collectSQLStats (napr. SQLStatsExtension uvnitr testu) po skonceni pricte sve pocty k nadrazenemu.
+    """
+    installSQLStats()
+    parent = sqlStatsVar.get()
+    stats = SQLStats()
+    token = sqlStatsVar.set(stats)
+    try:
+        yield stats
+    finally:
+        sqlStatsVar.reset(token)
+        if parent is not None:
+            parent.statements += stats.statements
+            parent.seconds += stats.seconds
+            parent.rows += stats.rows
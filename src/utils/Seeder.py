@@ -0,0 +1,205 @@
+"""Generator syntetickych dat a hromadne nahrani do databaze (pro staging a benchmarky, nahrada DBFeeder pro velka data).
+
+    python -m src.utils.Seeder [--admissions 100] [--student-admissions 50000] [--exam-results 500000]
+        [--url postgresql+asyncpg://...] [--drop] [--seed 1] [--batch-size 10000]
+
+Bez --url se pouzije ComposeConnectionString (promenne prostredi). Na PostgreSQL (asyncpg) se data nahravaji
+pomoci COPY (copy_records_to_table), jinde vicerakovymi INSERT. Radky se generuji a nahravaji po davkach,
+pamet tedy neroste s poctem vysledku zkousek.
+"""
+import sys
+import time
+import uuid
+import random
+import asyncio
+import argparse
+import datetime
+
+from src.DBDefinitions import (
+    PaymentInfoModel,
+    PaymentModel,
+    AdmissionModel,
+    StudentAdmissionModel,
+    ExamTypeModel,
+    ExamModel,
+    ExamResultModel,
+)
+
+programNames = [
+    ("Informatika", "Computer Science"),
+    ("Kyberneticka bezpecnost", "Cyber Security"),
+    ("Vojenske technologie", "Military Technologies"),
+    ("Ekonomika obrany statu", "Defence Economics"),
+    ("Vojenske zdravotnictvi", "Military Medicine"),
+    ("Letectvi", "Aviation"),
+]
+
+examTypeNames = [
+    ("Pisemny test", "Written test", 0.0, 100.0),
+    ("Telesna zdatnost", "Physical fitness", 0.0, 50.0),
+    ("Pohovor", "Interview", 0.0, 20.0),
+    ("Jazykova zkouska", "Language exam", 0.0, 30.0),
+]
+
+def newId(rnd):
+    """Vraci uuid4 odvozene z rnd, stejne --seed tak dava stejne klice (reprodukovatelne benchmarky a staging)"""
+    return uuid.UUID(int=rnd.getrandbits(128), version=4)
+
+def generateRows(admissionCount, studentAdmissionCount, examResultCount, rnd, batchSize=10000):
+    """Generuje (dbModel, [radky]) v poradi, ve kterem je lze vlozit (cizi klice), radky jsou slovniky se jmeny sloupcu.
+    Kazde prijimaci rizeni ma platebni udaje, 2-4 typy zkousek se 2 terminy, studenti jsou rozdeleni
+    mezi rizeni rovnomerne, kazdy ma platbu a vysledky zkousek z terminu sveho rizeni.
+    """
+    assert (admissionCount > 0) or (studentAdmissionCount == 0), "student admissions need at least one admission"
+    paymentInfos, admissions, examTypes, exams = [], [], [], []
+    examsByAdmission = []
+    for index in range(admissionCount):
+        year = 2020 + (index % 6)
+        name, nameEn = programNames[index % len(programNames)]
+        start = datetime.datetime(year, 1, 1, 8, 0) + datetime.timedelta(days=rnd.randint(0, 30))
+        paymentInfo = {
+            "id": newId(rnd), "name": f"Poplatek {name} {year}", "name_en": f"Fee {nameEn} {year}",
+            "account_number": f"{rnd.randint(10**8, 10**9 - 1)}/0710", "specific_symbol": f"{year}{index:04d}",
+            "constant_symbol": "0308", "amount": float(rnd.choice([500, 700, 900])),
+        }
+        paymentInfos.append(paymentInfo)
+        admission = {
+            "id": newId(rnd), "name": f"{name} {year}/{year + 1}", "name_en": f"{nameEn} {year}/{year + 1}",
+            "program_id": newId(rnd), "payment_info_id": paymentInfo["id"],
+            "application_start_date": start,
+            "application_last_date": start + datetime.timedelta(days=60),
+            "payment_date": start + datetime.timedelta(days=65),
+            "condition_date": start + datetime.timedelta(days=180),
+            "request_condition_start_date": start + datetime.timedelta(days=150),
+            "request_condition_last_date": start + datetime.timedelta(days=170),
+            "request_exam_start_date": start + datetime.timedelta(days=70),
+            "request_exam_last_date": start + datetime.timedelta(days=80),
+            "request_enrollment_start_date": start + datetime.timedelta(days=200),
+            "request_enrollment_end_date": start + datetime.timedelta(days=220),
+            "end_date": start + datetime.timedelta(days=240),
+        }
+        admissions.append(admission)
+        admissionExams = []
+        for typeIndex in range(rnd.randint(2, len(examTypeNames))):
+            typeName, typeNameEn, minScore, maxScore = examTypeNames[typeIndex]
+            examType = {
+                "id": newId(rnd), "name": typeName, "name_en": typeNameEn,
+                "min_score": minScore, "max_score": maxScore, "admission_id": admission["id"],
+            }
+            examTypes.append(examType)
+            for term in range(2):
+                exam = {
+                    "id": newId(rnd), "name": f"{typeName} - termin {term + 1}", "name_en": f"{typeNameEn} - term {term + 1}",
+                    "exam_type_id": examType["id"], "exam_date": start + datetime.timedelta(days=90 + 7 * term + typeIndex),
+                }
+                exams.append(exam)
+                admissionExams.append((exam["id"], maxScore))
+        examsByAdmission.append(admissionExams)
+
+    yield PaymentInfoModel, paymentInfos
+    yield AdmissionModel, admissions
+    yield ExamTypeModel, examTypes
+    yield ExamModel, exams
+
+    # student je drzen jen jako (id, index rizeni), potrebny pro vysledky zkousek
+    students = []
+    for batchStart in range(0, studentAdmissionCount, batchSize):
+        payments, studentAdmissions = [], []
+        for index in range(batchStart, min(batchStart + batchSize, studentAdmissionCount)):
+            admissionIndex = index % admissionCount
+            admission = admissions[admissionIndex]
+            paymentId = newId(rnd)
+            payments.append({
+                "id": paymentId, "payment_info_id": admission["payment_info_id"],
+                "bank_unique_data": newId(rnd).hex[:16], "variable_symbol": f"{index:010d}",
+                "amount": paymentInfos[admissionIndex]["amount"],
+            })
+            studentAdmissionId = newId(rnd)
+            admissioned = rnd.random() < 0.4
+            studentAdmissions.append({
+                "id": studentAdmissionId, "admission_id": admission["id"], "student_id": newId(rnd),
+                "payment_id": paymentId, "admissioned": admissioned,
+                "enrollment_date": (admission["request_enrollment_start_date"] if admissioned else None),
+            })
+            students.append((studentAdmissionId, admissionIndex))
+        yield PaymentModel, payments
+        yield StudentAdmissionModel, studentAdmissions
+
+    if not students:
+        return
+    for batchStart in range(0, examResultCount, batchSize):
+        examResults = []
+        for index in range(batchStart, min(batchStart + batchSize, examResultCount)):
+            studentAdmissionId, admissionIndex = students[index % len(students)]
+            examId, maxScore = rnd.choice(examsByAdmission[admissionIndex])
+            examResults.append({
+                "id": newId(rnd), "exam_id": examId, "student_admission_id": studentAdmissionId,
+                "score": round(min(maxScore, max(0.0, rnd.gauss(maxScore * 0.6, maxScore * 0.2))), 1),
+            })
+        yield ExamResultModel, examResults
+
+def groupRecords(rows):
+    """Vraci [(sloupce, [zaznamy])] pro COPY, radky jsou seskupeny dle svych sloupcu.
+    Sloupec, ktery v radku chybi, tak neni zapsan jako NULL, ale uplatni se jeho vychozi hodnota.
+    """
+    groups = {}
+    for row in rows:
+        columns = tuple(row.keys())
+        groups.setdefault(columns, []).append(tuple(row.values()))
+    return list(groups.items())
+
+async def copyRecords(connection, dbModel, rows):
+    """Nahraje radky pomoci COPY (jen asyncpg)"""
+    table = dbModel.__table__
+    rawConnection = await connection.get_raw_connection()
+    for columns, records in groupRecords(rows):
+        await rawConnection.driver_connection.copy_records_to_table(table.name, records=records, columns=list(columns))
+
+async def insertRows(connection, dbModel, rows):
+    """Nahraje radky jednim vicerakovym INSERT (executemany)"""
+    await connection.execute(dbModel.__table__.insert(), rows)
+
+async def seedDatabase(asyncSessionMaker, batches):
+    """Nahraje davky (dbModel, [radky]) jednim spojenim, vraci {tablename: pocet radku}"""
+    counts = {}
+    async with asyncSessionMaker() as session:
+        connection = await session.connection()
+        useCopy = connection.dialect.driver == "asyncpg"
+        write = copyRecords if useCopy else insertRows
+        for dbModel, rows in batches:
+            if not rows:
+                continue
+            await write(connection, dbModel, rows)
+            tableName = dbModel.__tablename__
+            counts[tableName] = counts.get(tableName, 0) + len(rows)
+        await session.commit()
+    return counts
+
+async def seed(asyncSessionMaker, admissions=100, studentAdmissions=50000, examResults=500000, seed=1, batchSize=10000):
+    """Vygeneruje a nahraje synteticka data, vraci {tablename: pocet radku}"""
+    rnd = random.Random(seed)
+    return await seedDatabase(asyncSessionMaker, generateRows(admissions, studentAdmissions, examResults, rnd, batchSize=batchSize))
+
+async def main(argv):
+    from src.DBDefinitions import startEngine, ComposeConnectionString
+    parser = argparse.ArgumentParser(description="Synthetic data seeder")
+    parser.add_argument("--admissions", type=int, default=100)
+    parser.add_argument("--student-admissions", type=int, default=50000)
+    parser.add_argument("--exam-results", type=int, default=500000)
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--drop", action="store_true", help="drop and recreate all tables first")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    asyncSessionMaker = await startEngine(args.url or ComposeConnectionString(), makeDrop=args.drop, makeUp=True)
+    start = time.perf_counter()
+    counts = await seed(asyncSessionMaker, args.admissions, args.student_admissions, args.exam_results, seed=args.seed, batchSize=args.batch_size)
+    duration = time.perf_counter() - start
+    total = sum(counts.values())
+    for tableName, count in counts.items():
+        print(f"{tableName:<20} {count:10d}")
+    print(f"seeded {total} rows in {duration:.1f} s ({total / max(duration, 1e-9):.0f} rows/s)")
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
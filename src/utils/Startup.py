@@ -0,0 +1,137 @@
+import os
+import time
+import asyncio
+import logging
+import functools
+
+startupState = {
+    "phase": "starting",
+    "ready": False,
+    "error": None,
+    "progress": {},
+    "started": time.time(),
+    "finished": None,
+    "attempts": 0,
+    "task": None,
+}
+
+@functools.cache
+def getStartupGating():
+    """Vraci chovani GQL pred dokoncenim startu (inicializace dat):
+        STARTUP_GATING - "block" odmitne dotaz (503), "wait" pocka nejvyse STARTUP_WAIT_TIMEOUT (s) a pak odmitne,
+                         "off" dotaz provede nad castecne naplnenou databazi (degradovany rezim)
+    """
+    return {
+        "mode": os.environ.get("STARTUP_GATING", "block"),
+        "timeout": float(os.environ.get("STARTUP_WAIT_TIMEOUT", "10")),
+    }
+
+@functools.cache
+def getStartupRetries():
+    """Vraci opakovani inicializacni ulohy po chybe:
+        STARTUP_RETRIES - kolikrat je neuspesna uloha spustena znovu, pak je faze "failed" (viz /live)
+        STARTUP_RETRY_DELAY - prodleva (s) pred dalsim pokusem
+    """
+    return {
+        "retries": int(os.environ.get("STARTUP_RETRIES", "3")),
+        "delay": float(os.environ.get("STARTUP_RETRY_DELAY", "5")),
+    }
+
+def getStartupState():
+    """Stav startu pro /ready: faze, pripravenost, chyba a postup (pocty nahranych radku dle tabulek)"""
+    finished = startupState["finished"]
+    return {
+        "phase": startupState["phase"],
+        "ready": startupState["ready"],
+        "error": startupState["error"],
+        "attempts": startupState["attempts"],
+        "progress": dict(startupState["progress"]),
+        "elapsed": round((finished or time.time()) - startupState["started"], 3),
+    }
+
+def setStartupPhase(phase):
+    startupState["phase"] = phase
+    logging.info(f"startup phase {phase}")
+
+def reportProgress(tableName, count):
+    """Callback pro importery, count je celkovy pocet zpracovanych radku tabulky"""
+    startupState["progress"][tableName] = count
+
+def markReady():
+    startupState["phase"] = "ready"
+    startupState["ready"] = True
+    startupState["finished"] = time.time()
+
+def resetStartupState():
+    startupState.update(phase="starting", ready=False, error=None, progress={}, started=time.time(), finished=None, attempts=0, task=None)
+
+def trackStartupTask(job, phase="seeding", readyOnSuccess=True, retries=None, delay=None):
+    """Spusti inicializacni ulohu job (asynchronni funkce bez parametru) na pozadi a sleduje ji.
+    Chyba je zalogovana, vystavena v getStartupState a uloha je po prodleve spustena znovu (viz getStartupRetries),
+    job tedy musi byt opakovatelny. Po vycerpani pokusu je faze "failed".
+    Po uspesnem dokonceni je sluzba oznacena za pripravenou (readyOnSuccess).
+    """
+    options = getStartupRetries()
+    retries = options["retries"] if retries is None else retries
+    delay = options["delay"] if delay is None else delay
+
+    async def run():
+        for attempt in range(retries + 1):
+            setStartupPhase(phase)
+            startupState["attempts"] = attempt + 1
+            try:
+                return await job()
+            except Exception as error:
+                startupState["error"] = f"{type(error).__name__}: {error}"
+                if attempt == retries:
+                    raise
+                logging.warning(f"startup task {phase} failed (attempt {attempt + 1}), retrying in {delay} s", exc_info=error)
+                setStartupPhase("retrying")
+                await asyncio.sleep(delay)
+
+    def onDone(task):
+        if task.cancelled():
+            startupState["phase"] = "cancelled"
+            return
+        error = task.exception()
+        if error is not None:
+            startupState["phase"] = "failed"
+            logging.error(f"startup task {phase} failed", exc_info=error)
+            return
+        startupState["error"] = None
+        if readyOnSuccess:
+            markReady()
+
+    task = asyncio.create_task(run())
+    task.add_done_callback(onDone)
+    startupState["task"] = task
+    return task
+
+def isStartupFailed():
+    """Inicializace definitivne selhala (vycerpany pokusy), worker je potreba restartovat"""
+    return startupState["phase"] == "failed"
+
+async def waitForReady(timeout):
+    """Pocka nejvyse timeout (s) na dokonceni sledovane ulohy, vraci, zda je sluzba pripravena"""
+    if startupState["ready"]:
+        return True
+    task = startupState["task"]
+    if (task is None) or (timeout <= 0):
+        return False
+    try:
+        # shield, vyprseni cekani nesmi ulohu zrusit
+        await asyncio.wait_for(asyncio.shield(task), timeout)
+    except Exception:
+        pass
+    return startupState["ready"]
+
+async def cancelStartupTask():
+    """Zrusi nedokoncenou inicializacni ulohu (ukonceni workeru behem inicializace)"""
+    task = startupState["task"]
+    if (task is None) or task.done():
+        return
+    task.cancel()
+    try:
+        await task
+    except (asyncio.CancelledError, Exception):
+        pass
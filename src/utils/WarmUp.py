@@ -0,0 +1,85 @@
+import os
+import json
+import time
+import asyncio
+import logging
+import functools
+
+defaultWarmUpQueries = [
+    {
+        "name": "admissions",
+        "query": """query warmUpAdmissions { admissionPage(limit: 100) {
+            id name nameEn lastchange applicationStartDate applicationLastDate endDate
+            paymentInfo { id name amount }
+            examTypes { id name minScore maxScore }
+        } }""",
+    },
+    {
+        "name": "exam_types",
+        "query": """query warmUpExamTypes { examTypePage(limit: 1000) {
+            id name nameEn minScore maxScore masterExamTypeId
+            subExamTypes { id name }
+            exams { id name examDate }
+        } }""",
+    },
+    {
+        "name": "payment_infos",
+        "query": """query warmUpPaymentInfos { paymentInfoPage(limit: 1000) { id name nameEn accountNumber amount } }""",
+    },
+]
+
+@functools.cache
+def getWarmUpOptions():
+    """Vraci nastaveni zahrivani workeru z promennych prostredi:
+        WARMUP_ENABLED - "False" zahrivani vypne
+        WARMUP_QUERIES_FILE - json [{"name": ..., "query": ..., "variables": {...}}], jinak defaultWarmUpQueries
+        WARMUP_CONCURRENCY - kolikrat soucasne je kazdy dotaz proveden (pripravene dotazy asyncpg jsou per spojeni)
+        WARMUP_TIMEOUT - nejdelsi doba (s) zahrivani, po ni je worker oznacen za pripraveny i tak
+    """
+    queries = defaultWarmUpQueries
+    filename = os.environ.get("WARMUP_QUERIES_FILE", None)
+    if filename:
+        with open(filename, "r", encoding="utf-8") as f:
+            queries = json.load(f)
+    return {
+        "enabled": os.environ.get("WARMUP_ENABLED", "True") in ["True", "true"],
+        "queries": queries,
+        "concurrency": int(os.environ.get("WARMUP_CONCURRENCY", "2")),
+        "timeout": float(os.environ.get("WARMUP_TIMEOUT", "60")),
+    }
+
+class WarmUpRequest:
+    """Nahrada requestu pro dotazy zahrivani, nema token ani cookies"""
+    cookies = {}
+    headers = {}
+
+# identita pro interni dotazy, RBACExtension se pro ni na UG nedotazuje
+warmUpUser = {"id": None, "roles": []}
+
+async def warmUp(schema, asyncSessionMaker, queries=None, concurrency=None):
+    """Provede reprezentativni dotazy, ktere naplni procesne sdilene cache (dokumenty, mapovani poli, radky),
+    cache prelozenych SQL prikazu SQLAlchemy a pripravene dotazy asyncpg na pouzitych spojenich.
+    Chyba dotazu zahrivani je jen zalogovana. Vraci {jmeno dotazu: doba (s)}.
+    """
+    from src.utils.Dataloaders import createLoadersContext
+    options = getWarmUpOptions()
+    queries = options["queries"] if queries is None else queries
+    concurrency = options["concurrency"] if concurrency is None else concurrency
+
+    async def execute(item):
+        context = {
+            **createLoadersContext(asyncSessionMaker),
+            "request": WarmUpRequest(),
+            "serviceUser": warmUpUser,
+        }
+        result = await schema.execute(query=item["query"], variable_values=item.get("variables", None), context_value=context)
+        if result.errors:
+            logging.warning(f"warm up query {item.get('name', '')} failed {result.errors}")
+
+    durations = {}
+    for index, item in enumerate(queries):
+        name = item.get("name", f"query{index}")
+        start = time.perf_counter()
+        await asyncio.gather(*(execute(item) for _ in range(max(1, concurrency))))
+        durations[name] = round(time.perf_counter() - start, 3)
+    return durations
@@ -0,0 +1,90 @@
+import os
+import json
+import time
+import base64
+import asyncio
+import aiohttp
+import functools
+from fastapi import Request, HTTPException
+
+from uoishelpers.schema.WhoAmIExtension import mequery
+
+from .Cache import createCacheFromEnv
+from .Metrics import registerCache
+from .gql_ug_proxy import getUGClient
+
+@functools.cache
+def getIdentityCache():
+    """Vraci procesne sdileny cache identit (vysledku dotazu me na UG), klic je token (WHOAMI_CACHE_MAXSIZE, WHOAMI_CACHE_TTL).
+    Identita neni drzena dele nez do exp z JWT, viz getIdentity.
+    """
+    return createCacheFromEnv("WHOAMI_CACHE", 10000, 60)
+
+registerCache("whoami", getIdentityCache)
+
+def getTokenExpiration(token):
+    """Vraci exp (unix time) z payloadu JWT, podpis se neoveruje (overuje ho UG), pro jiny token None"""
+    try:
+        [_, payload, *__] = token.split(".")
+        payload = base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+        exp = json.loads(payload).get("exp", None)
+        return None if exp is None else float(exp)
+    except Exception:
+        return None
+
+async def getIdentity(token, ugQuery):
+    """Vraci identitu (me) pro token, pri opakovanem dotazu se stejnym tokenem z cache.
+    ugQuery je asynchronni funkce ugQuery(query=...) vracejici odpoved UG.
+    Identita je drzena nejdele WHOAMI_CACHE_TTL a nikdy po exp tokenu, bez tokenu se necachuje.
+    """
+    cache = getIdentityCache()
+    if token is not None:
+        identity = cache.get(token)
+        if identity is not None:
+            return identity
+
+    response = await ugQuery(query=mequery)
+    identity = (response.get("data", None) or {}).get("me", None)
+
+    if (token is not None) and (identity is not None):
+        ttl = cache.ttl
+        exp = getTokenExpiration(token)
+        if exp is not None:
+            ttl = min(ttl, exp - time.time())
+        if ttl > 0:
+            cache.set(token, identity, ttl=ttl)
+    return identity
+
+def getJWT(request: Request):
+    """Vraci JWT z cookie authorization nebo z hlavicky Authorization: Bearer ..., jinak None.
+    Pouziva i RBACExtension.getJWT, pravidlo je tedy stejne pro GQL i ostatni routy.
+    """
+    jwtsource = request.cookies.get("authorization", None)
+    if jwtsource is None:
+        authorization = request.headers.get("Authorization", None)
+        if authorization is not None and authorization.startswith("Bearer "):
+            jwtsource = authorization[len("Bearer "):]
+    return jwtsource
+
+def isDEMO():
+    return os.getenv("DEMO", None) == "True"
+
+async def whoAmI(request: Request):
+    """Vraci uzivatele (vysledek dotazu me na UG) pro token z requestu, cestou sdilenou s RBACExtension
+    (getJWT, getIdentity a sdilena proxy na UG). Pro neplatny token nebo bez tokenu vraci to, co vrati UG (None).
+    Chyby spojeni na UG propaguje (aiohttp.ClientError, asyncio.TimeoutError).
+    """
+    token = getJWT(request)
+    return await getIdentity(token, getUGClient(token))
+
+async def isRequestAuthentized(request: Request):
+    """Pro routy mimo GQL stejne pravidlo jako OnlyForAuthentized: v DEMO rezimu vse, jinak jen prihlaseny uzivatel.
+    Pokud UG neodpovida, vyvola HTTPException 503 (ne 500 ani 401).
+    """
+    if isDEMO():
+        return True
+    try:
+        user = await whoAmI(request)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+        raise HTTPException(status_code=503, detail=f"user service is not available ({type(error).__name__})", headers={"Retry-After": "5"})
+    return user is not None
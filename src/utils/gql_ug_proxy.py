@@ -1,59 +1,122 @@
-import aiohttp
-import requests
 import os
+import asyncio
+import aiohttp
 from contextlib import asynccontextmanager
-from functools import cache
-from fastapi import Request
 
-@cache
+from .Cache import createCacheFromEnv
+
+def getConnectorOptions():
+    """Nastaveni spojeni na UG z promennych prostredi:
+        UG_PROXY_LIMIT - maximalni pocet soucasnych spojeni
+        UG_PROXY_LIMIT_PER_HOST - maximalni pocet soucasnych spojeni na jeden server
+        UG_PROXY_KEEPALIVE - jak dlouho (s) drzet nepouzivane spojeni otevrene
+        UG_PROXY_TIMEOUT - celkovy timeout jednoho dotazu (s)
+        UG_PROXY_CONNECT_TIMEOUT - timeout navazani spojeni (s)
+    """
+    return {
+        "limit": int(os.environ.get("UG_PROXY_LIMIT", "100")),
+        "limit_per_host": int(os.environ.get("UG_PROXY_LIMIT_PER_HOST", "30")),
+        "keepalive_timeout": float(os.environ.get("UG_PROXY_KEEPALIVE", "30")),
+        "timeout": float(os.environ.get("UG_PROXY_TIMEOUT", "10")),
+        "connect_timeout": float(os.environ.get("UG_PROXY_CONNECT_TIMEOUT", "3")),
+    }
+
+proxies = {}
+
 def createProxy(url):
+    """Vraci (jednu pro kazde url) proxy na UG.
+    Proxy drzi jednu dlouho zijici aiohttp.ClientSession (spojeni jsou znovu pouzivana),
+    relace pro jednotlive tokeny jsou drzeny v omezenem cache (UG_PROXY_CONNECTIONS_MAXSIZE, UG_PROXY_CONNECTIONS_TTL).
+    """
     assert url is not None, "createProxy(url) url is None"
-    print(f"proxy for {url} created")
+    result = proxies.get(url, None)
+    if result is not None:
+        return result
+
+    options = getConnectorOptions()
+    connections = createCacheFromEnv("UG_PROXY_CONNECTIONS", 1000, 300)
+
     class _Session:
-        def __init__(self, authorizationToken):
+        def __init__(self, proxy, authorizationToken):
+            self.proxy = proxy
             self.authorizationToken = authorizationToken
-            
-        # async def asyncpost(self, query, variables={}):
-        #     async with aiohttp.ClientSession() as session:
-        #         json = {"query": query, "variables": variables}
-        #         headers = {}
-        #         if self.authorizationToken:
-        #             headers["authorization"] = f"Bearer {self.authorizationToken}"
-        #         async with session.post(url=url, json=json, headers=headers) as response:
-        #             responsejson = await response.json()
-        #             return responsejson
-        
+
+        async def asyncpost(self, query, variables={}):
+            headers = {}
+            if self.authorizationToken:
+                headers["authorization"] = f"Bearer {self.authorizationToken}"
+            return await self.proxy.asyncpost(query=query, variables=variables, headers=headers)
+
     class Proxy:
+        def __init__(self):
+            # ClientSession je svazana s event loop, ve kterem vznikla, proto jedna pro kazdou smycku
+            self.sessions = {}
+
+        async def getClientSession(self):
+            loop = asyncio.get_running_loop()
+            session = self.sessions.get(loop, None)
+            if (session is None) or session.closed:
+                # relace smycek, ktere uz skoncily, se uzavrou, jinak by zustala otevrena jejich spojeni
+                for oldLoop in [oldLoop for oldLoop in self.sessions if oldLoop.is_closed()]:
+                    await self.sessions.pop(oldLoop).close()
+                connector = aiohttp.TCPConnector(
+                    limit=options["limit"],
+                    limit_per_host=options["limit_per_host"],
+                    keepalive_timeout=options["keepalive_timeout"],
+                )
+                timeout = aiohttp.ClientTimeout(total=options["timeout"], connect=options["connect_timeout"])
+                # cookies se nesdili, session je spolecna pro vsechny uzivatele
+                session = aiohttp.ClientSession(connector=connector, timeout=timeout, cookie_jar=aiohttp.DummyCookieJar())
+                self.sessions[loop] = session
+            return session
+
+        async def asyncpost(self, query, variables={}, headers={}):
+            json = {"query": query, "variables": variables}
+            session = await self.getClientSession()
+            async with session.post(url=url, json=json, headers=headers) as response:
+                response.raise_for_status()
+                return await response.json()
+
+        async def post(self, query, variables={}):
+            return await self.asyncpost(query=query, variables=variables)
+
         @asynccontextmanager
         async def Session(self, authorizationToken):
-            result = self.connection(authorizationToken=authorizationToken)
-            yield result
-            pass
-            
-        @cache
+            yield self.connection(authorizationToken=authorizationToken)
+
         def connection(self, authorizationToken):
-            result = _Session(authorizationToken=authorizationToken)
-            return result
-        
-        def post(self, query, variables={}):
-            json = {"query": query, "variables": variables}
-            response = requests.post(url=url, json=json)
-            result = response.json()
+            result = connections.get(authorizationToken)
+            if result is None:
+                result = connections.set(authorizationToken, _Session(self, authorizationToken=authorizationToken))
             return result
 
-    return Proxy()
-
+        def stats(self):
+            return connections.stats()
 
+        async def close(self):
+            sessions, self.sessions = self.sessions, {}
+            loop = asyncio.get_running_loop()
+            for sessionLoop, session in sessions.items():
+                if (sessionLoop is not loop) and sessionLoop.is_running():
+                    # smycka v jinem vlakne, relace se uzavre v ni
+                    asyncio.run_coroutine_threadsafe(session.close(), sessionLoop)
+                else:
+                    await session.close()
+            connections.clear()
 
-def get_ug_connection(request: Request):
-    GQLUG_ENDPOINT_URL = os.environ.get("GQLUG_ENDPOINT_URL", None)
-    gqlproxy = createProxy(GQLUG_ENDPOINT_URL)
+    result = Proxy()
+    proxies[url] = result
+    return result
 
-    authorizationToken = None
-    authorizationBrearer = request.headers.get("authorization", None)
-    if authorizationBrearer is None:
-        authorizationToken = request.cookies.get("authorization", None)
-    else:
-        [_, authorizationToken, *__] = authorizationBrearer.split(" ")
+async def closeProxies():
+    """Uzavre spojeni vsech proxy, volat pri ukonceni aplikace"""
+    for proxy in proxies.values():
+        await proxy.close()
 
-    return gqlproxy.connection(authorizationToken=authorizationToken)
\ No newline at end of file
+def getUGClient(authorizationToken):
+    """Vraci asynchronni funkci ugQuery(query=..., variables=...) pro dotazy na UG (GQLUG_ENDPOINT_URL) s danym tokenem.
+    Dotazy jdou pres sdilenou proxy, tedy pres jednu ClientSession a jeji spojeni.
+    """
+    url = os.environ.get("GQLUG_ENDPOINT_URL", None)
+    assert url is not None, "missing explicit configuration, 'GQLUG_ENDPOINT_URL'"
+    return createProxy(url).connection(authorizationToken=authorizationToken).asyncpost
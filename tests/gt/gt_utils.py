@@ -242,4 +242,22 @@ def createDeleteTest2(tableName, variables=None, expectedJson=None):
             assert "errors" not in responseJson, f"update failed {responseJson}"
             logging.info(f"query for {queryDelete} with {_variables}, no tested response")
         
-    return result_test
\ No newline at end of file
+    return result_test
+
+
+def createMaxStatementsTest2(tableName, queryName, maxStatements, variables=None):
+    """Test, ze dotaz provede nejvyse maxStatements SQL prikazu (odhali N+1 dotazy v resolverech)"""
+    @pytest.mark.asyncio
+    async def result_test(SchemaExecutorDemo):
+        from src.utils.SQLStats import collectSQLStats
+        query = getQuery(tableName=tableName, queryName=queryName)
+        _variables = variables
+        if _variables is None:
+            _variables = getVariables(tableName=tableName, queryName=queryName)
+        with collectSQLStats() as stats:
+            responseJson = await SchemaExecutorDemo(query=query, variable_values=_variables)
+        assert "errors" not in responseJson, f"query for {query} with {_variables}, got error {responseJson}"
+        logging.info(f"query {queryName}@{tableName} executed {stats.asDict()}")
+        assert stats.statements <= maxStatements, f"query {queryName}@{tableName} executed {stats.statements} SQL statements, expected at most {maxStatements} {stats.asDict()}"
+
+    return result_test
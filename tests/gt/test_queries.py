@@ -5,6 +5,7 @@ from .gt_utils import (
     createUpdateTest2,
     createTest2,
     createDeleteTest2,
+    createMaxStatementsTest2,
     getQuery
 )
 
@@ -197,6 +198,26 @@ test_admission_delete = createDeleteTest2(      # povinne parametry jako v creat
     }
 )
 
+# Read nested Admission tree (eager loading planner)
+@pytest.mark.asyncio
+async def test_admission_tree(SchemaExecutorDemo):
+    query = getQuery(tableName="admissions", queryName="readtree")
+    response = await SchemaExecutorDemo(query=query, variable_values={})
+    assert "errors" not in response, f"got errors {response}"
+    [admission, *_] = response["data"]["result"]
+    assert len(admission["studentAdmissions"]) > 0, f"expected student admissions {admission}"
+    examResults = [examResult for studentAdmission in admission["studentAdmissions"] for examResult in studentAdmission["examResults"]]
+    assert len(examResults) > 0, f"expected exam results {admission}"
+    for examResult in examResults:
+        assert examResult["exam"]["examType"]["id"] is not None, f"expected exam type {examResult}"
+
+# loadery musi davkovat, pocet prikazu nesmi rust s poctem radku (N+1)
+test_admission_tree_statements = createMaxStatementsTest2(
+    tableName="admissions",
+    queryName="readtree",
+    maxStatements=10
+)
+
 # # Custom Tests
 # @pytest.mark.asyncio
 # async def test_admission_invalid_date_range(SchemaExecutorDemo):
@@ -322,6 +343,35 @@ test_exam_result_delete = createDeleteTest2(
     }
 )
 
+@pytest.mark.asyncio
+async def test_exam_results_insert_update_many(SchemaExecutorDemo):
+    exam_id = "a15d2b5f-3e0f-4f9e-8f1e-9d3a2c2c8b3f"
+    student_admission_id = "89b10735-ef94-49d4-965f-fbd475d65d1f"
+    exam_results = [
+        {"score": 10.0, "examId": exam_id, "studentAdmissionId": student_admission_id},
+        {"score": 20.0, "examId": exam_id, "studentAdmissionId": student_admission_id},
+        {"score": 30.0, "examId": "00000000-0000-0000-0000-000000000000", "studentAdmissionId": student_admission_id},
+    ]
+    query = getQuery(tableName="exam_results", queryName="createmany")
+    response = await SchemaExecutorDemo(query=query, variable_values={"exam_results": exam_results})
+    assert "errors" not in response, f"got errors {response}"
+    [first, second, invalid] = response["data"]["examResultsInsertMany"]
+    assert first["__typename"] == "ExamResultGQLModel", f"expected inserted row {first}"
+    assert second["score"] == 20.0, f"expected inserted row {second}"
+    assert invalid["failed"] is True, f"expected error for row with unknown exam {invalid}"
+
+    exam_results = [
+        {"id": first["id"], "lastchange": first["lastchange"], "score": 11.0},
+        {"id": second["id"], "lastchange": "2000-01-01T00:00:00", "score": 21.0},
+    ]
+    query = getQuery(tableName="exam_results", queryName="updatemany")
+    response = await SchemaExecutorDemo(query=query, variable_values={"exam_results": exam_results})
+    assert "errors" not in response, f"got errors {response}"
+    [updated, stale] = response["data"]["examResultsUpdateMany"]
+    assert updated["score"] == 11.0, f"expected updated row {updated}"
+    assert stale["failed"] is True, f"expected lastchange error {stale}"
+    assert stale["Entity"]["lastchange"] == second["lastchange"], f"expected unchanged row {stale}"
+
 # @pytest.mark.asyncio
 # async def test_exam_result_relationships(SchemaExecutorDemo):
 #     exam_result_id = "1a1bc900-8b48-4a88-883c-1d9237aae24d"
@@ -0,0 +1,110 @@
+import pytest
+from .shared import prepare_demodata, prepare_in_memory_sqllite
+
+def test_ttlcache_lru_and_expiration():
+    from src.utils.Cache import TTLCache
+    now = [0.0]
+    cache = TTLCache(maxsize=2, ttl=10, timer=lambda: now[0])
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None, "least recently used item should be evicted"
+    assert cache.get("a") == 1
+
+    now[0] = 11.0
+    assert cache.get("a") is None, "item should expire after ttl"
+    assert cache.stats()["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_loader_uses_shared_cache():
+    from src.utils.Cache import TTLCache
+    from src.utils.Dataloaders import createLoaders
+    from src.DBDefinitions import AdmissionModel
+
+    async_session_maker = await prepare_in_memory_sqllite()
+    await prepare_demodata(async_session_maker)
+
+    rowCache = TTLCache(maxsize=100, ttl=60)
+    loaders = createLoaders(async_session_maker, rowCache=rowCache, cachedTables=frozenset(["admissions"]))
+    [row, *_] = await loaders.admissions.page(limit=1)
+
+    assert await loaders.admissions.load(row.id) is not None
+    assert ("admissions", row.id) in rowCache
+
+    otherloaders = createLoaders(async_session_maker, rowCache=rowCache, cachedTables=frozenset(["admissions"]))
+    cachedrow = await otherloaders.AdmissionModel.load(row.id)
+    assert cachedrow is rowCache.get(("admissions", row.id))
+
+    await otherloaders.admissions.delete(row.id)
+    assert ("admissions", row.id) not in rowCache
+
+
+@pytest.mark.asyncio
+async def test_keyset_page_walks_whole_table():
+    from src.utils.Dataloaders import createLoaders
+    from src.Dataloaders.Cursor import encodeCursor
+
+    async_session_maker = await prepare_in_memory_sqllite()
+    await prepare_demodata(async_session_maker)
+
+    loaders = createLoaders(async_session_maker)
+    allrows = await loaders.exam_results.page(limit=1000)
+    assert len(allrows) > 2
+
+    for orderby, desc in [(None, None), ("score", None), ("score", True)]:
+        expected = await loaders.exam_results.page(limit=1000, orderby=orderby, desc=desc)
+        walked = []
+        after = None
+        while True:
+            rows = await loaders.exam_results.page(limit=2, orderby=orderby, desc=desc, after=after)
+            if not rows:
+                break
+            walked.extend(rows)
+            after = encodeCursor(rows[-1], orderby)
+        assert [row.id for row in walked] == [row.id for row in expected], f"orderby={orderby}, desc={desc}"
+        assert len(walked) == len(allrows)
+
+    with pytest.raises(ValueError):
+        await loaders.exam_results.page(limit=2, orderby="score", after=encodeCursor(allrows[0], None))
+    # nezname orderby nesmi tise strankovat jen pres NULL hodnoty
+    with pytest.raises(ValueError):
+        encodeCursor(allrows[0], "unknown")
+
+    class Row:
+        id = allrows[0].id
+        unknown = 1
+    with pytest.raises(ValueError):
+        await loaders.exam_results.page(limit=2, orderby="unknown", after=encodeCursor(Row(), "unknown"))
+
+def test_create_cache_from_env(monkeypatch):
+    from src.utils.Cache import createCacheFromEnv
+    monkeypatch.setenv("TEST_CACHE_MAXSIZE", "3")
+    cache = createCacheFromEnv("TEST_CACHE", 100, 5)
+    assert (cache.maxsize, cache.ttl) == (3, 5.0)
+
+@pytest.mark.asyncio
+async def test_primed_pages_are_invalidated_by_writes():
+    import uuid
+    from src.utils.Dataloaders import createLoaders
+
+    async_session_maker = await prepare_in_memory_sqllite()
+    await prepare_demodata(async_session_maker)
+    loaders = createLoaders(async_session_maker)
+    loader = loaders.exam_results
+
+    [row, *_] = await loader.page(limit=1)
+    key = row.student_admission_id
+    primed = (await loader.page_by_fkey("student_admission_id", [key], limit=1000))[key]
+    assert await loader.page(extendedfilter={"student_admission_id": key}, limit=1000) is primed
+
+    class Entity:
+        id = uuid.uuid4()
+        student_admission_id = key
+        exam_id = row.exam_id
+        score = 1.0
+    await loader.insert(Entity())
+    rows = await loader.page(extendedfilter={"student_admission_id": key}, limit=1000)
+    assert Entity.id in [row.id for row in rows], "page after insert must not be the stale primed page"
@@ -0,0 +1,82 @@
+import io
+import json
+import uuid
+import datetime
+import pytest
+
+def test_stream_json_rows_small_chunks():
+    from src.utils.DBFeeder import streamJsonRows
+    with open("./systemdata.json", "r", encoding="utf-8") as f:
+        data = json.load(f)
+    expected = [(tableName, row) for tableName, rows in data.items() for row in rows]
+    with open("./systemdata.json", "r", encoding="utf-8") as f:
+        # maly kus vynuti rozdeleni retezcu i objektu mezi cteni
+        assert list(streamJsonRows(f, chunkSize=7)) == expected
+    assert list(streamJsonRows(io.StringIO('{"a": [], "b": [{"id": 1}] }'))) == [("b", {"id": 1})]
+
+@pytest.mark.asyncio
+async def test_import_json_file_coerces_by_column_types():
+    from sqlalchemy import select
+    from src.DBDefinitions import startEngine, AdmissionModel
+    from src.utils.DBFeeder import importJsonFile, initDB
+
+    asyncSessionMaker = await startEngine("sqlite+aiosqlite:///:memory:", makeDrop=True, makeUp=True)
+    await initDB(asyncSessionMaker)
+    # opakovany import nic nezdvoji
+    counts = await importJsonFile(asyncSessionMaker, [AdmissionModel], "./systemdata.json", batchSize=2)
+    assert counts == {"rows": {"admissions": 1}, "rejected": {}}
+
+    async with asyncSessionMaker() as session:
+        admissions = (await session.execute(select(AdmissionModel))).scalars().all()
+    assert len(admissions) == 1
+    [admission] = admissions
+    assert isinstance(admission.id, uuid.UUID)
+    assert isinstance(admission.payment_info_id, uuid.UUID)
+    assert isinstance(admission.application_start_date, datetime.datetime)
+    assert admission.application_start_date.tzinfo is None
+
+@pytest.mark.asyncio
+async def test_concurrent_init_db_skips_rows_of_other_worker(tmp_path):
+    import asyncio
+    from sqlalchemy import select, func
+    from src.DBDefinitions import startEngine, ExamResultModel
+    from src.utils.DBFeeder import initDB, get_demodata
+
+    url = f"sqlite+aiosqlite:///{tmp_path / 'concurrent.sqlite'}"
+    first = await startEngine(url, makeDrop=True, makeUp=True)
+    second = await startEngine(url, makeDrop=False, makeUp=True)
+    # dva workery nad stejnou databazi, oba najdou tabulky prazdne
+    await asyncio.gather(initDB(first), initDB(second))
+
+    async with first() as session:
+        count = (await session.execute(select(func.count(ExamResultModel.id)))).scalar()
+    assert count == len(get_demodata()["exam_results"])
+
+def test_convert_row_booleans():
+    from src.DBDefinitions import StudentAdmissionModel
+    from src.utils.DBFeeder import getColumnConverters, convertRow
+
+    converters = getColumnConverters(StudentAdmissionModel)
+    for value, expected in [(True, True), (False, False), ("false", False), ("0", False), ("1", True), ("True", True), (0, False)]:
+        assert convertRow("student_admissions", converters, {"admissioned": value}) == {"admissioned": expected}, value
+    rejected = {}
+    assert convertRow("student_admissions", converters, {"admissioned": "maybe"}, rejected) == {}, "invalid boolean is rejected"
+    convertRow("student_admissions", converters, {"admissioned": "never"}, rejected)
+    assert rejected == {"student_admissions.admissioned": 2}
+
+@pytest.mark.asyncio
+async def test_import_json_file_checks_table_order(tmp_path):
+    from sqlalchemy import select, func
+    from src.DBDefinitions import startEngine, PaymentInfoModel, AdmissionModel
+    from src.utils.DBFeeder import importJsonFile
+
+    with open("./systemdata.json", "r", encoding="utf-8") as f:
+        data = json.load(f)
+    filename = tmp_path / "reordered.json"
+    filename.write_text(json.dumps({"admissions": data["admissions"], "payment_infos": data["payment_infos"]}), encoding="utf-8")
+
+    asyncSessionMaker = await startEngine("sqlite+aiosqlite:///:memory:", makeDrop=True, makeUp=True)
+    with pytest.raises(ValueError):
+        await importJsonFile(asyncSessionMaker, [PaymentInfoModel, AdmissionModel], filename)
+    async with asyncSessionMaker() as session:
+        assert (await session.execute(select(func.count(AdmissionModel.id)))).scalar() == 0, "nothing is written"
@@ -0,0 +1,23 @@
+import pytest
+
+@pytest.mark.asyncio
+async def test_document_cache_skips_parse(Context, monkeypatch):
+    monkeypatch.setenv("GQLUG_ENDPOINT_URL", "http://localhost:8125/gql")
+    from src.GraphTypeDefinitions import schema
+    from src.GraphTypeDefinitions.DocumentCache import getDocumentCache
+
+    query = "{ admissionPage(limit: 3) { id } }"
+    cache = getDocumentCache()
+    cache.invalidate(query)
+
+    first = await schema.execute(query=query, context_value=Context)
+    assert first.errors is None, first.errors
+    hits = cache.hits
+    second = await schema.execute(query=query, context_value=Context)
+    assert second.errors is None, second.errors
+    assert second.data == first.data
+    assert cache.hits == hits + 1
+
+    invalid = await schema.execute(query="{ admissionPage { unknownField } }", context_value=Context)
+    assert invalid.errors is not None
+    assert "{ admissionPage { unknownField } }" not in cache
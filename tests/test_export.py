@@ -0,0 +1,43 @@
+import json
+import aiohttp
+import pytest
+from .shared import prepare_demodata, prepare_in_memory_sqllite
+
+@pytest.mark.asyncio
+async def test_export_student_admissions():
+    from src.utils.Export import streamStudentAdmissions, toNDJSON, toCSV
+    from src.utils.DBFeeder import get_demodata
+
+    async_session_maker = await prepare_in_memory_sqllite()
+    await prepare_demodata(async_session_maker)
+    data = get_demodata()
+
+    lines = [line async for line in toNDJSON(streamStudentAdmissions(async_session_maker, batchSize=2))]
+    records = [json.loads(line) for line in lines]
+    assert len(records) == len(data["student_admissions"])
+    examResults = [examResult for record in records for examResult in record["exam_results"]]
+    assert len(examResults) == len([item for item in data["exam_results"] if item.get("student_admission_id", None) is not None])
+
+    chunks = [chunk async for chunk in toCSV(streamStudentAdmissions(async_session_maker, batchSize=2))]
+    [header, *rows] = "".join(chunks).splitlines()
+    assert "exam_result.score" in header.split(",")
+    assert len(rows) == sum(max(len(record["exam_results"]), 1) for record in records)
+
+@pytest.mark.parametrize("ugQueryResult, statusCode", [
+    ({"data": {"me": None}}, 401),
+    (aiohttp.ClientConnectionError("user service is down"), 503),
+])
+def test_export_requires_authentized_user(monkeypatch, ugQueryResult, statusCode):
+    from fastapi.testclient import TestClient
+    from main import app
+    import src.utils.WhoAmI as WhoAmI
+
+    async def ugQuery(query, variables={}):
+        if isinstance(ugQueryResult, Exception):
+            raise ugQueryResult
+        return ugQueryResult
+
+    monkeypatch.delenv("DEMO", raising=False)
+    monkeypatch.setattr(WhoAmI, "getUGClient", lambda token: ugQuery)
+    response = TestClient(app).get("/export/student_admissions", cookies={"authorization": "invalid-token"})
+    assert response.status_code == statusCode
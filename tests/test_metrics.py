@@ -0,0 +1,29 @@
+import pytest
+
+@pytest.mark.asyncio
+async def test_metrics_operation_resolver_loader(Context, monkeypatch):
+    monkeypatch.setenv("GQLUG_ENDPOINT_URL", "http://localhost:8125/gql")
+    from prometheus_client import generate_latest
+    from src.GraphTypeDefinitions import schema
+    from src.utils import Metrics
+
+    monkeypatch.setattr(Metrics, "getResolverSampleRate", lambda: 1.0)
+    query = "query admissionMetrics { admissionPage(limit: 3) { id studentAdmissions { id } paymentInfo { id } } }"
+    result = await schema.execute(query=query, context_value=Context)
+    assert result.errors is None, result.errors
+
+    text = generate_latest().decode("utf-8")
+    assert 'gql_admissions_operation_duration_seconds_count{operation_name="admissionMetrics",operation_type="query"}' in text
+    assert 'gql_admissions_resolver_duration_seconds_count{field_name="admissionPage",type_name="Query"}' in text
+    assert 'gql_admissions_loader_batch_size_count' in text
+    assert 'gql_admissions_cache_hit_ratio{cache="documents"}' in text
+
+def test_metrics_multiprocess_contains_cache_series(monkeypatch, tmp_path):
+    import os
+    from fastapi.testclient import TestClient
+    from main import app
+
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    response = TestClient(app).get("/metrics")
+    assert response.status_code == 200
+    assert f'gql_admissions_cache_size{{cache="whoami",pid="{os.getpid()}"}}' in response.text
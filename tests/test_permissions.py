@@ -0,0 +1,21 @@
+import pytest
+
+def test_only_for_authentized_verdict_is_cached(monkeypatch):
+    monkeypatch.delenv("DEMO", raising=False)
+    from src.GraphTypeDefinitions.Permissions import OnlyForAuthentized, isAuthentized
+
+    class Info:
+        def __init__(self, context):
+            self.context = context
+
+    context = {"user": {"id": "51d101a0-81f1-44ca-8366-6cf51432e8d6"}}
+    info = Info(context)
+    assert OnlyForAuthentized().has_permission(None, info) is True
+    assert context["authentized"] is True
+
+    context["user"] = None
+    assert isAuthentized(info) is True, "verdict is evaluated once per request"
+
+    assert isAuthentized(Info({"user": None, "request": None})) is False
+    monkeypatch.setenv("DEMO", "True")
+    assert isAuthentized(Info({"user": None})) is True
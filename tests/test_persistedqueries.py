@@ -0,0 +1,25 @@
+import pytest
+
+@pytest.mark.asyncio
+async def test_persisted_query_by_hash(Context, monkeypatch):
+    monkeypatch.setenv("GQLUG_ENDPOINT_URL", "http://localhost:8125/gql")
+    from src.GraphTypeDefinitions import schema
+    from src.GraphTypeDefinitions.PersistedQueries import queryHash, getPersistedQueries
+
+    query = "{ admissionPage(limit: 2) { id } }"
+    persistedQuery = {"persistedQuery": {"version": 1, "sha256Hash": queryHash(query)}}
+    getPersistedQueries().invalidate(queryHash(query))
+
+    result = await schema.execute(query=None, context_value=Context, operation_extensions=persistedQuery)
+    assert result.errors[0].message == "PersistedQueryNotFound"
+
+    result = await schema.execute(query=query, context_value=Context, operation_extensions=persistedQuery)
+    assert result.errors is None, result.errors
+    expected = result.data
+
+    result = await schema.execute(query=None, context_value=Context, operation_extensions=persistedQuery)
+    assert result.errors is None, result.errors
+    assert result.data == expected
+
+    result = await schema.execute(query="{ hello }", context_value=Context, operation_extensions=persistedQuery)
+    assert result.errors is not None, "hash mismatch should be rejected"
@@ -0,0 +1,23 @@
+import pytest
+
+@pytest.mark.asyncio
+async def test_profiling_header(Context, monkeypatch):
+    monkeypatch.setenv("GQLUG_ENDPOINT_URL", "http://localhost:8125/gql")
+    from src.GraphTypeDefinitions import schema
+
+    class Request:
+        cookies = {}
+        headers = {"x-profile": "text"}
+
+    query = "{ examTypePage(limit: 3) { id } }"
+    plain = await schema.execute(query=query, context_value=Context)
+    assert plain.errors is None, plain.errors
+    assert "profile" not in (plain.extensions or {})
+
+    profiled = await schema.execute(query=query, context_value={**Context, "request": Request()})
+    assert profiled.errors is None, profiled.errors
+    assert profiled.data == plain.data
+    profile = profiled.extensions["profile"]
+    assert profile["format"] == "text"
+    assert "error" not in profile
+    assert isinstance(profile["output"], str)
@@ -0,0 +1,48 @@
+import pytest
+from graphql import parse
+
+def test_estimate_cost_multiplies_limits():
+    from src.GraphTypeDefinitions import schema
+    from src.GraphTypeDefinitions.QueryCost import estimateCost
+
+    document = parse("""query($limit: Int) {
+        admissionPage(limit: $limit) {
+            id
+            studentAdmissions(limit: 5) { id admission { id } }
+            ...F
+        }
+    }
+    fragment F on AdmissionGQLModel { paymentInfo { id } }
+    """)
+    cost, depth = estimateCost(schema._schema, document, variables={"limit": 100})
+    # 100 admissions, 500 student admissions, 500 admissions, 100 payment infos
+    assert cost == 100 + 500 + 500 + 100
+    assert depth == 3
+
+    cost, depth = estimateCost(schema._schema, document, variables={})
+    assert cost == 10 + 50 + 50 + 10, "default limit of admissionPage should be used"
+
+@pytest.mark.asyncio
+async def test_expensive_query_is_rejected(SchemaExecutorDemo, monkeypatch):
+    from src.GraphTypeDefinitions.QueryCost import getCostLimits
+    limits = {**getCostLimits(), "maxCost": 100}
+    monkeypatch.setattr("src.GraphTypeDefinitions.QueryCost.getCostLimits", lambda: limits)
+
+    response = await SchemaExecutorDemo(query="{ admissionPage(limit: 1000) { id } }")
+    assert "errors" in response, f"expected rejection {response}"
+    assert response["data"] is None
+
+    response = await SchemaExecutorDemo(query="{ admissionPage(limit: 10) { id } }")
+    assert "errors" not in response, f"got errors {response}"
+
+def test_throttle_is_released_with_its_loop():
+    import gc
+    import asyncio
+    from src.GraphTypeDefinitions.QueryCost import getThrottle, throttles
+
+    async def create():
+        return getThrottle(2)
+    count = len(throttles)
+    asyncio.run(create())
+    gc.collect()
+    assert len(throttles) == count, "semaphore of finished loop is not kept"
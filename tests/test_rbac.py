@@ -0,0 +1,75 @@
+import re
+import pytest
+
+@pytest.mark.asyncio
+async def test_rbac_loader_batches_and_caches():
+    from src.utils.Cache import TTLCache
+    from src.GraphTypeDefinitions.RBAC import RBACLoader
+
+    queries = []
+    async def gqlclient(query, variables={}):
+        queries.append(query)
+        aliases = re.findall(r'(h[0-9a-f]+): rbacById\(id: "([^"]+)"\)', query)
+        return {"data": {alias: {"judgement": id == "allowed"} for alias, id in aliases}}
+
+    cache = TTLCache(maxsize=100, ttl=60)
+    loader = RBACLoader(gqlclient=gqlclient, user_id="user", cache=cache)
+    roles = ("administrátor",)
+    results = await loader.load_many([
+        {"id": "allowed", "roles": roles},
+        {"id": "denied", "roles": roles},
+        {"id": "allowed", "roles": roles},
+    ])
+    assert results == [True, False, True]
+    assert len(queries) == 1, "all judgements should be asked in one query"
+    assert '["administrátor"]' in queries[0]
+
+    otherloader = RBACLoader(gqlclient=gqlclient, user_id="user", cache=cache)
+    assert await otherloader.load({"id": "allowed", "roles": roles}) is True
+    assert len(queries) == 1, "judgement should be taken from shared cache"
+
+    otheruser = RBACLoader(gqlclient=gqlclient, user_id="other", cache=cache)
+    assert await otheruser.load({"id": "allowed", "roles": roles}) is True
+    assert len(queries) == 2, "shared cache is per user"
+
+@pytest.mark.asyncio
+async def test_rbac_loader_does_not_cache_errors_and_separates_anonymous():
+    from src.utils.Cache import TTLCache
+    from src.GraphTypeDefinitions.RBAC import RBACLoader, serviceUserKey
+
+    responses = [
+        {"data": None, "errors": [{"message": "rbac is not available"}]},
+        {"data": {}},
+    ]
+    queries = []
+    async def gqlclient(query, variables={}):
+        queries.append(query)
+        if responses:
+            return responses.pop(0)
+        aliases = re.findall(r'(h[0-9a-f]+): rbacById\(id: "([^"]+)"\)', query)
+        return {"data": {alias: {"judgement": True} for alias, id in aliases}}
+
+    cache = TTLCache(maxsize=100, ttl=60)
+    struct = {"id": "allowed", "roles": ("administrátor",)}
+    assert await RBACLoader(gqlclient=gqlclient, cache=cache).load(struct) is False
+    assert await RBACLoader(gqlclient=gqlclient, cache=cache).load(struct) is False
+    assert len(cache) == 0, "errored or missing judgements must not be cached"
+    assert await RBACLoader(gqlclient=gqlclient, cache=cache).load(struct) is True
+    assert len(queries) == 3
+
+    assert await RBACLoader(gqlclient=gqlclient, user_id=serviceUserKey, cache=cache).load(struct) is True
+    assert len(queries) == 4, "anonymous and service judgements are cached separately"
+
+@pytest.mark.asyncio
+async def test_rbac_loader_is_created_lazily(SchemaExecutor, Context):
+    from src.GraphTypeDefinitions.RBAC import getRBACLoaderFromInfo
+
+    result = await SchemaExecutor("{ admissionPage(limit: 1) { id } }")
+    assert "errors" not in result, result
+    assert "RBACLoader" not in Context, "no field needs RBAC, loader is not created"
+
+    class Info:
+        context = Context
+    loader = getRBACLoaderFromInfo(Info())
+    assert loader is getRBACLoaderFromInfo(Info())
+    assert loader.user_id == Context["user"]["id"]
@@ -0,0 +1,55 @@
+import os
+import pytest
+
+@pytest.mark.asyncio
+async def test_seeder_consistent_rows():
+    from sqlalchemy import select, func
+    from src.DBDefinitions import startEngine, AdmissionModel, StudentAdmissionModel, ExamResultModel, ExamModel, ExamTypeModel
+    from src.utils.Seeder import seed
+
+    asyncSessionMaker = await startEngine("sqlite+aiosqlite:///:memory:", makeDrop=True, makeUp=True)
+    counts = await seed(asyncSessionMaker, admissions=3, studentAdmissions=25, examResults=120, batchSize=10)
+    assert counts["admissions"] == 3
+    assert counts["student_admissions"] == 25
+    assert counts["payments"] == 25
+    assert counts["exam_results"] == 120
+
+    async with asyncSessionMaker() as session:
+        # vysledek zkousky je vzdy z terminu rizeni, do ktereho student patri
+        statement = (
+            select(func.count(ExamResultModel.id))
+            .join(StudentAdmissionModel, StudentAdmissionModel.id == ExamResultModel.student_admission_id)
+            .join(ExamModel, ExamModel.id == ExamResultModel.exam_id)
+            .join(ExamTypeModel, ExamTypeModel.id == ExamModel.exam_type_id)
+            .where(ExamTypeModel.admission_id == StudentAdmissionModel.admission_id)
+        )
+        assert (await session.execute(statement)).scalar() == 120
+        assert (await session.execute(select(func.count(AdmissionModel.id)))).scalar() == 3
+
+def test_seeder_ids_are_reproducible():
+    import random
+    from src.utils.Seeder import generateRows
+
+    def ids(seed):
+        return [
+            (dbModel.__tablename__, [tuple(row.values()) for row in rows])
+            for dbModel, rows in generateRows(2, 5, 10, random.Random(seed), batchSize=4)
+        ]
+    assert ids(7) == ids(7), "same seed gives same keys and values"
+    assert ids(7) != ids(8)
+
+def test_group_records_keeps_defaults_of_missing_columns():
+    from src.utils.Seeder import groupRecords
+
+    rows = [{"id": 1, "name": "a"}, {"id": 2}, {"id": 3, "name": "c"}]
+    assert groupRecords(rows) == [(("id", "name"), [(1, "a"), (3, "c")]), (("id",), [(2,)])]
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not os.environ.get("TEST_POSTGRES_URL"), reason="TEST_POSTGRES_URL (postgresql+asyncpg://...) is not set")
+async def test_seeder_copy_postgres():
+    from src.DBDefinitions import startEngine
+    from src.utils.Seeder import seed
+
+    asyncSessionMaker = await startEngine(os.environ["TEST_POSTGRES_URL"], makeDrop=True, makeUp=True)
+    counts = await seed(asyncSessionMaker, admissions=2, studentAdmissions=10, examResults=30, batchSize=4)
+    assert counts["exam_results"] == 30
@@ -0,0 +1,24 @@
+import asyncio
+import pytest
+
+@pytest.mark.asyncio
+async def test_single_call_concurrent_first_calls():
+    from main import singleCall
+
+    calls = []
+    @singleCall
+    async def initialize():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        if len(calls) == 1:
+            raise RuntimeError("first attempt fails")
+        return object()
+
+    results = await asyncio.gather(*(initialize() for _ in range(5)), return_exceptions=True)
+    assert len(calls) == 2, "failed initialization is retried once, then shared by all waiting calls"
+    [failed, *succeeded] = results
+    assert isinstance(failed, RuntimeError)
+    assert all(result is succeeded[0] for result in succeeded)
+
+    assert await initialize() is succeeded[0]
+    assert len(calls) == 2
@@ -0,0 +1,17 @@
+import pytest
+from .shared import prepare_in_memory_sqllite
+
+@pytest.mark.asyncio
+async def test_nested_sql_stats_are_added_to_parent():
+    from sqlalchemy import text
+    from src.utils.SQLStats import collectSQLStats
+
+    async_session_maker = await prepare_in_memory_sqllite()
+    with collectSQLStats() as outer:
+        async with async_session_maker() as session:
+            await session.execute(text("select 1"))
+            with collectSQLStats() as inner:
+                await session.execute(text("select 2"))
+                await session.execute(text("select 3"))
+    assert inner.statements == 2
+    assert outer.statements >= 3, "statements counted by nested collector belong to the parent too"
@@ -0,0 +1,65 @@
+import asyncio
+import pytest
+
+@pytest.mark.asyncio
+async def test_startup_task_tracking():
+    from src.utils import Startup
+
+    Startup.resetStartupState()
+    release = asyncio.Event()
+
+    async def seeding():
+        Startup.reportProgress("admissions", 10)
+        await release.wait()
+
+    Startup.trackStartupTask(seeding, phase="seeding")
+    await asyncio.sleep(0)
+    state = Startup.getStartupState()
+    assert state["phase"] == "seeding"
+    assert state["ready"] is False
+    assert state["progress"] == {"admissions": 10}
+    assert await Startup.waitForReady(0.01) is False, "waiting must not cancel the task"
+
+    release.set()
+    assert await Startup.waitForReady(1) is True
+    assert Startup.getStartupState()["phase"] == "ready"
+
+    Startup.resetStartupState()
+    attempts = []
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError("duplicate key")
+
+    Startup.trackStartupTask(flaky, phase="seeding", retries=2, delay=0)
+    assert await Startup.waitForReady(1) is True, "failed seeding is retried"
+    state = Startup.getStartupState()
+    assert state["attempts"] == 3
+    assert state["error"] is None
+
+    Startup.resetStartupState()
+    async def failing():
+        raise RuntimeError("database is not reachable")
+
+    Startup.trackStartupTask(failing, phase="seeding", retries=1, delay=0)
+    assert await Startup.waitForReady(1) is False
+    state = Startup.getStartupState()
+    assert state["phase"] == "failed"
+    assert state["attempts"] == 2
+    assert "database is not reachable" in state["error"]
+    assert Startup.isStartupFailed()
+    Startup.resetStartupState()
+
+def test_ready_and_live_report_failed_startup():
+    from fastapi.testclient import TestClient
+    from main import app
+    from src.utils import Startup
+
+    client = TestClient(app)
+    Startup.resetStartupState()
+    assert client.get("/live").status_code == 200
+    assert client.get("/ready").status_code == 503
+    Startup.startupState["phase"] = "failed"
+    assert client.get("/ready").status_code == 500
+    assert client.get("/live").status_code == 500
+    Startup.resetStartupState()
@@ -0,0 +1,66 @@
+import asyncio
+import pytest
+
+@pytest.mark.asyncio
+async def test_ug_proxy_reuses_session_and_bounds_connections(monkeypatch):
+    monkeypatch.setenv("UG_PROXY_CONNECTIONS_MAXSIZE", "2")
+    from src.utils.gql_ug_proxy import createProxy, closeProxies
+
+    proxy = createProxy("http://localhost:8125/gql?proxytest")
+    assert createProxy("http://localhost:8125/gql?proxytest") is proxy
+
+    connection = proxy.connection(authorizationToken="token1")
+    response = await connection.asyncpost(query="{ me { id } }")
+    assert response["data"]["me"]["id"] is not None
+    session = await proxy.getClientSession()
+    await proxy.connection(authorizationToken="token2").asyncpost(query="{ me { id } }")
+    assert await proxy.getClientSession() is session, "client session should be reused"
+
+    assert proxy.connection(authorizationToken="token1") is connection
+    proxy.connection(authorizationToken="token3")
+    assert proxy.stats()["size"] == 2
+
+    await closeProxies()
+    assert session.closed
+
+@pytest.mark.asyncio
+async def test_ug_queries_share_proxy_session(monkeypatch):
+    monkeypatch.setenv("GQLUG_ENDPOINT_URL", "http://localhost:8125/gql")
+    from src.utils.gql_ug_proxy import createProxy, getUGClient
+    from src.utils.WhoAmI import whoAmI, getIdentityCache
+    from src.GraphTypeDefinitions.RBAC import RBACExtension
+
+    class Request:
+        cookies = {"authorization": "token-shared-session"}
+        headers = {}
+
+    class ExecutionContext:
+        context = {"request": Request()}
+
+    proxy = createProxy("http://localhost:8125/gql")
+    await getUGClient("token1")(query="{ me { id } }")
+    session = await proxy.getClientSession()
+
+    extension = RBACExtension()
+    extension.execution_context = ExecutionContext()
+    response = await extension.ug_query(query="{ me { id } }")
+    assert response["data"]["me"]["id"] is not None
+    getIdentityCache().clear()
+    assert await whoAmI(Request()) is not None
+    assert await proxy.getClientSession() is session, "schema extension and request helper should reuse the proxy session"
+
+def test_ug_proxy_closes_session_of_finished_loop():
+    from src.utils.gql_ug_proxy import createProxy
+
+    proxy = createProxy("http://localhost:8125/gql?looptest")
+    async def query():
+        await proxy.connection(authorizationToken="token").asyncpost(query="{ me { id } }")
+        return await proxy.getClientSession()
+
+    first = asyncio.run(query())
+    second = asyncio.run(query())
+    assert first is not second
+    assert first.closed, "session of finished loop is closed, not leaked"
+    assert not second.closed
+    asyncio.run(proxy.close())
+    assert second.closed
@@ -0,0 +1,20 @@
+import pytest
+
+@pytest.mark.asyncio
+async def test_warm_up_fills_document_cache(Context):
+    from src.GraphTypeDefinitions import schema
+    from src.GraphTypeDefinitions.DocumentCache import getDocumentCache
+    from src.utils.SQLStats import collectSQLStats
+    from src.utils.WarmUp import warmUp, defaultWarmUpQueries
+
+    asyncSessionMaker = Context["loaders"].admissions.asyncSessionMaker
+    for item in defaultWarmUpQueries:
+        getDocumentCache().invalidate(item["query"])
+
+    # GQLUG_ENDPOINT_URL neni nastaveno, zahrivani se na UG nedotazuje
+    with collectSQLStats() as stats:
+        durations = await warmUp(schema, asyncSessionMaker, concurrency=2)
+    assert set(durations.keys()) == {item["name"] for item in defaultWarmUpQueries}
+    assert stats.rows > 0, "warm up queries must reach the database"
+    for item in defaultWarmUpQueries:
+        assert item["query"] in getDocumentCache()
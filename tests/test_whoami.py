@@ -0,0 +1,38 @@
+import json
+import time
+import base64
+import pytest
+
+def makeToken(exp):
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode()).decode().rstrip("=")
+    return f"header.{payload}.signature"
+
+@pytest.mark.asyncio
+async def test_identity_is_cached_per_token_until_exp():
+    from src.utils.WhoAmI import getIdentity, getIdentityCache, getTokenExpiration
+
+    calls = []
+    async def ugQuery(query, variables={}):
+        calls.append(query)
+        return {"data": {"me": {"id": "51d101a0-81f1-44ca-8366-6cf51432e8d6", "roles": []}}}
+
+    cache = getIdentityCache()
+    cache.clear()
+    hits = cache.hits
+
+    token = makeToken(time.time() + 3600)
+    assert getTokenExpiration(token) is not None
+    first = await getIdentity(token, ugQuery)
+    second = await getIdentity(token, ugQuery)
+    assert first is second
+    assert len(calls) == 1
+    assert cache.hits == hits + 1
+
+    expired = makeToken(time.time() - 1)
+    await getIdentity(expired, ugQuery)
+    await getIdentity(expired, ugQuery)
+    assert len(calls) == 3, "identity for expired token must not be cached"
+
+    await getIdentity(None, ugQuery)
+    await getIdentity(None, ugQuery)
+    assert len(calls) == 5, "request without token must not be cached"